@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (c) 2020 Felix Arnold
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+Memory benchmark for the device representation.
+
+Compares the slotted RadioMotor, which keeps only the decoded status fields, with the previous layout, which kept
+the same attributes in an instance dictionary together with the complete last status message.
+
+Usage: python benchmarks/memory.py
+"""
+
+from asyncio import (
+    run,
+    sleep,
+)
+from gc import collect
+from json import (
+    dumps,
+    loads,
+)
+from os.path import (
+    abspath,
+    dirname,
+)
+from sys import path
+from tracemalloc import (
+    get_traced_memory,
+    start,
+    stop,
+)
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+from siro import (  # noqa: E402
+    Bridge,
+    Driver,
+    MSG_TYPES,
+    RadioMotor,
+)
+
+DEVICE_COUNTS = (1000, 10000)
+
+
+class _DictRadioMotor(object):
+    """
+    The previous layout of a RadioMotor: all attributes in the instance dictionary and the complete last message.
+    """
+
+    def __init__(self, motor: RadioMotor, message: dict) -> None:
+        for cls in type(motor).__mro__:
+            for attribute in getattr(cls, '__slots__', ()):
+                if attribute != '__weakref__' and hasattr(motor, attribute):
+                    setattr(self, attribute, getattr(motor, attribute))
+        self._callbacks = set()
+        self._msg_status = message
+
+
+def _report(mac: str) -> bytes:
+    """
+    Creates a Report datagram for a device.
+    """
+    return dumps({
+        'msgType': MSG_TYPES['REPORT'],
+        'mac': mac,
+        'deviceType': '10000000',
+        'data': {
+            'type': 1,
+            'operation': 1,
+            'currentPosition': 42,
+            'currentAngle': 0,
+            'currentState': 3,
+            'voltageMode': 1,
+            'batteryLevel': 1180,
+            'wirelessMode': 1,
+            'RSSI': -61,
+        },
+    }).encode()
+
+
+async def _measure(count: int) -> (int, int):
+    """
+    Measures the memory of the given number of devices in both layouts.
+
+    Returns
+    -------
+    Tuple of bytes for the slotted and the dictionary based devices.
+    """
+    bridge = Bridge('0' * 32, Driver(), callback_address='127.0.0.1')
+    macs = ['%012x' % i for i in range(count)]
+
+    collect()
+    start()
+    before = get_traced_memory()[0]
+    motors = []
+    for mac in macs:
+        motor = RadioMotor(mac, bridge)
+        motor.status = loads(_report(mac))
+        motors.append(motor)
+    bridge.scheduler.close()
+    await sleep(0)
+    collect()
+    slotted = get_traced_memory()[0] - before
+    stop()
+
+    collect()
+    start()
+    before = get_traced_memory()[0]
+    legacy = [_DictRadioMotor(motor, loads(_report(motor.mac))) for motor in motors]
+    collect()
+    dictionary = get_traced_memory()[0] - before
+    stop()
+    del legacy
+    return slotted, dictionary
+
+
+async def main() -> None:
+    print(f'{"devices":>8} {"layout":>12} {"total KiB":>10} {"bytes/device":>13}')
+    for count in DEVICE_COUNTS:
+        slotted, dictionary = await _measure(count)
+        print(f'{count:>8} {"__slots__":>12} {slotted / 1024:>10.1f} {slotted / count:>13.0f}')
+        print(f'{count:>8} {"__dict__":>12} {dictionary / 1024:>10.1f} {dictionary / count:>13.0f}')
+
+
+if __name__ == '__main__':
+    run(main())
@@ -0,0 +1,173 @@
+# MIT License
+#
+# Copyright (c) 2020 Felix Arnold
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+STOP latency benchmark for the outbound scheduler.
+
+Keeps the queue of a bridge filled with bulk and poll requests and issues STOP requests in between. The bridge is
+simulated by a stub transport, which acknowledges write requests after a random radio delay and loses a few of them.
+The latency from queueing a STOP until its acknowledgement is reported for the STOP lane of the scheduler and, as
+baseline, for STOP requests queued like bulk requests.
+
+Usage: python benchmarks/stop_latency.py
+"""
+
+from asyncio import (
+    get_event_loop,
+    run,
+    sleep,
+)
+from itertools import count
+from logging import getLogger
+from os.path import (
+    abspath,
+    dirname,
+)
+from random import Random
+from statistics import median
+from sys import path
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+from siro import (  # noqa: E402
+    MSG_TYPES,
+    PRIORITY_BULK,
+    PRIORITY_POLL,
+    PRIORITY_STOP,
+    STATUS,
+    STOP,
+)
+from siro.siro import _OutboundScheduler  # noqa: E402
+
+QUEUE_DEPTHS = (0, 20, 100)
+STOP_COUNT = 20
+STOP_INTERVAL = 0.25
+ACK_DELAY = (0.02, 0.08)
+ACK_LOSS = 0.02
+SETTLE_TIMEOUT = 30
+SEED = 1
+
+
+class _AckingBridge(object):
+    """
+    Stub transport of a bridge, which acknowledges write requests after a random delay and loses some of them.
+    """
+
+    def __init__(self, loop) -> None:
+        self.scheduler: _OutboundScheduler = None
+        self._loop = loop
+        self._random = Random(SEED)
+        self.queued: dict = {}
+        self.latencies: dict = {}
+
+    def transmit(self, payload: dict) -> None:
+        if payload['msgType'] != MSG_TYPES['WRITE'] or self._random.random() < ACK_LOSS:
+            return
+        self._loop.call_later(self._random.uniform(*ACK_DELAY), self._acknowledge, payload['msgID'])
+
+    def _acknowledge(self, msg_id: str) -> None:
+        self.scheduler.acknowledge(msg_id)
+        if msg_id in self.queued:
+            self.latencies[msg_id] = self._loop.time() - self.queued.pop(msg_id)
+
+
+def _payload(msg_id: str, mac: str, operation: int) -> dict:
+    """
+    Creates a write request.
+    """
+    return {
+        'msgType': MSG_TYPES['WRITE'],
+        'mac': mac,
+        'deviceType': '10000000',
+        'AccessToken': '0' * 32,
+        'msgID': msg_id,
+        'data': {'operation': operation},
+    }
+
+
+async def _measure(depth: int, stop_priority: int) -> (list, int, float):
+    """
+    Issues STOP requests while the queue is kept at the given depth.
+
+    Returns
+    -------
+    Tuple of the STOP latencies in seconds, the number of STOPs without acknowledgement and the final send rate.
+    """
+    loop = get_event_loop()
+    bridge = _AckingBridge(loop)
+    scheduler = _OutboundScheduler(bridge.transmit, loop, getLogger('siro.benchmark'))
+    bridge.scheduler = scheduler
+    msg_ids = count()
+    running = True
+
+    async def load() -> None:
+        while running:
+            while scheduler.queue_length < depth:
+                msg_id = str(next(msg_ids))
+                priority = PRIORITY_BULK if int(msg_id) % 2 else PRIORITY_POLL
+                scheduler.submit(_payload(msg_id, '%012x' % (int(msg_id) % 30), STATUS), priority)
+            await sleep(0.01)
+
+    load_task = loop.create_task(load())
+    await sleep(1)
+    stops = []
+    for stop in range(STOP_COUNT):
+        msg_id = f'stop{stop}'
+        bridge.queued[msg_id] = loop.time()
+        scheduler.submit(_payload(msg_id, f'ffff{stop:08x}', STOP), stop_priority)
+        stops.append(msg_id)
+        await sleep(STOP_INTERVAL)
+    deadline = loop.time() + SETTLE_TIMEOUT
+    while bridge.queued and loop.time() < deadline:
+        await sleep(STOP_INTERVAL)
+    running = False
+    await load_task
+    rate = scheduler.rate
+    scheduler.close()
+    latencies = [bridge.latencies[msg_id] for msg_id in stops if msg_id in bridge.latencies]
+    return latencies, len(stops) - len(latencies), rate
+
+
+def _percentile(values: list, share: float) -> float:
+    """
+    Returns the value below which the given share of the sorted values lies.
+    """
+    return values[min(len(values) - 1, int(share * len(values)))]
+
+
+async def main() -> None:
+    print(f'{"depth":>6} {"STOP queued as":>15} {"acked":>6} {"lost":>5} {"min ms":>8} {"p50 ms":>8} '
+          f'{"p90 ms":>8} {"max ms":>8} {"rate/s":>7}')
+    for depth in QUEUE_DEPTHS:
+        for name, priority in (('STOP lane', PRIORITY_STOP), ('bulk', PRIORITY_BULK)):
+            latencies, lost, rate = await _measure(depth, priority)
+            latencies = sorted(latency * 1000 for latency in latencies)
+            if not latencies:
+                print(f'{depth:>6} {name:>15} {0:>6} {lost:>5}')
+                continue
+            print(f'{depth:>6} {name:>15} {len(latencies):>6} {lost:>5} {latencies[0]:>8.1f} '
+                  f'{median(latencies):>8.1f} {_percentile(latencies, 0.9):>8.1f} {latencies[-1]:>8.1f} '
+                  f'{rate:>7.2f}')
+
+
+if __name__ == '__main__':
+    run(main())
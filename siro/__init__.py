@@ -36,21 +36,49 @@ from siro.siro import (
     RadioMotor,
 )
 from siro.const import (
+    BULK_MODE_PACED,
+    BULK_MODE_SKEW,
     CALLBACK_PORT,
     CONFIGFILE_DEVICE_NAMES,
+    CONFIGFILE_SNAPSHOT,
     CURRENT_STATE,
+    DISCOVERY_RESENDS,
+    DISCOVERY_WINDOW,
     DOWN,
+    FIELD_ANGLE,
+    FIELD_BATTERY,
+    FIELD_LAST_ACTION,
+    FIELD_MOVEMENT_STATE,
+    FIELD_NUMBER_OF_DEVICES,
+    FIELD_ONLINE,
+    FIELD_OPERATION,
+    FIELD_POSITION,
+    FIELD_RSSI,
+    FIELD_STATE,
+    FIELD_TYPE,
+    FIELD_VOLTAGE_MODE,
+    FIELD_WIRELESS_MODE,
+    HEARTBEAT_GRACE,
     LOG_FILE,
     LOGLEVEL,
+    METRICS_PORT,
     MSG_TYPES,
     MULTICAST_GRP,
+    POLL_BUDGET,
+    POLL_INTERVAL,
     POSITION,
+    PRIORITY_BULK,
+    PRIORITY_POLL,
+    PRIORITY_STOP,
+    PRIORITY_USER,
     RADIO_MOTOR,
+    READY_DEADLINE,
     SEND_PORT,
     STATE_DOWN,
     STATE_UP,
     STATUS,
     STOP,
+    UDP_RETRIES,
     UDP_TIMEOUT,
     UP,
     WIFI_BRIDGE,
@@ -34,6 +34,10 @@ __topic__ = "Home Automation"
 
 # Config File
 CONFIGFILE_DEVICE_NAMES = 'names.json'
+NAME_STORE_CHECK_INTERVAL = 1
+NAME_STORE_FLUSH_DELAY = 1
+CONFIGFILE_SNAPSHOT = 'snapshot.json'
+SNAPSHOT_FLUSH_DELAY = 5
 
 # Logging
 CRITICAL = 50
@@ -58,6 +62,65 @@ CALLBACK_PORT = 32101
 SEND_PORT = 32100
 MULTICAST_GRP = '238.0.0.18'
 UDP_TIMEOUT = 2
+UDP_MAX_PAYLOAD = 65507
+UDP_RETRIES = 2
+DISCOVERY_WINDOW = 3
+DISCOVERY_RESENDS = 2
+
+# Outbound Scheduling
+SEND_RATE = 5.0
+SEND_RATE_MIN = 1.0
+SEND_RATE_MAX = 20.0
+SEND_RATE_INCREASE = 1.0
+SEND_RATE_DECREASE = 0.5
+SEND_BURST = 3
+STOP_LATENCY_SAMPLES = 100
+
+# Liveness
+HEARTBEAT_GRACE = 120
+LIVENESS_CHECK_INTERVAL = 10
+
+# Priorities
+PRIORITY_STOP = 0
+PRIORITY_USER = 1
+PRIORITY_BULK = 2
+PRIORITY_POLL = 3
+
+# Initial Status Sweep
+SWEEP_CONCURRENCY = 2
+SWEEP_RESENDS = 3
+READY_DEADLINE = 30
+
+# Status Polling
+POLL_INTERVAL = 60
+POLL_BUDGET = 0.2
+POLL_FOLLOW_UP_INTERVAL = 5
+POLL_FOLLOW_UP_WINDOW = 60
+BI_DIRECTIONAL_MODES = (1, 2)
+
+# Bulk Requests
+BULK_MODE_PACED = 0
+BULK_MODE_SKEW = 1
+BULK_INTERVAL_PACED = 0.15
+BULK_INTERVAL_SKEW = 0.02
+BULK_WINDOW_PACED = 2
+
+# Coalescing of Position Requests
+COALESCE_DELAY = 0.2
+COALESCE_MAX_DELAY = 0.5
+
+# Travel Rate Learning
+TRAVEL_SMOOTHING = 0.3
+
+# Protocol Trace
+TRACE_SIZE = 1000
+TRACE_IN = 'in'
+TRACE_OUT = 'out'
+
+# Metrics
+METRICS_PORT = 9632
+METRICS_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COMMAND_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
 
 # Positions
 STATE_DOWN = 100
@@ -71,6 +134,21 @@ POSITION = 3
 ANGLE = 4
 STATUS = 5
 
+# Status Fields
+FIELD_TYPE = 'type'
+FIELD_OPERATION = 'operation'
+FIELD_POSITION = 'position'
+FIELD_ANGLE = 'angle'
+FIELD_STATE = 'state'
+FIELD_VOLTAGE_MODE = 'voltage_mode'
+FIELD_BATTERY = 'battery_level'
+FIELD_WIRELESS_MODE = 'wireless_mode'
+FIELD_RSSI = 'rssi'
+FIELD_LAST_ACTION = 'last_action'
+FIELD_MOVEMENT_STATE = 'movement_state'
+FIELD_NUMBER_OF_DEVICES = 'number_of_devices'
+FIELD_ONLINE = 'online'
+
 # Dictionaries
 DEVICE_TYPES = {
     '02000001': 'Wi-Fi Bridge',
@@ -115,6 +193,10 @@ OPERATIONS = {
     4: 'Angle',
     5: 'Status query',
 }
+BULK_MODES = {
+    0: 'Fastest safe pacing',
+    1: 'Minimum skew',
+}
 VOLTAGE_MODE = {
     0: 'AC Motor',
     1: 'DC Motor',
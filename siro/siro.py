@@ -32,12 +32,27 @@ __topic__ = "Home Automation"
 
 from asyncio import (
     AbstractEventLoop,
+    AbstractServer,
     DatagramProtocol,
+    Future,
+    IncompleteReadError,
+    LimitOverrunError,
+    Lock,
+    Semaphore,
+    StreamReader,
+    StreamWriter,
+    TimeoutError as AsyncTimeoutError,
+    ensure_future,
+    gather,
     get_event_loop,
+    sleep,
+    start_server,
+    wait,
 )
 from abc import (
     ABC,
 )
+from inspect import isawaitable
 from json import (
     load,
     loads,
@@ -45,21 +60,80 @@ from json import (
     dumps,
 )
 from .const import (
+    BI_DIRECTIONAL_MODES,
+    BULK_INTERVAL_PACED,
+    BULK_INTERVAL_SKEW,
+    BULK_MODE_PACED,
+    BULK_MODE_SKEW,
+    BULK_WINDOW_PACED,
     CALLBACK_PORT,
+    COALESCE_DELAY,
+    COALESCE_MAX_DELAY,
+    COMMAND_BUCKETS,
     CONFIGFILE_DEVICE_NAMES,
+    CONFIGFILE_SNAPSHOT,
     CURRENT_STATE,
+    DEBUG,
+    DISCOVERY_RESENDS,
+    DISCOVERY_WINDOW,
     DOWN,
+    FIELD_ANGLE,
+    FIELD_BATTERY,
+    FIELD_LAST_ACTION,
+    FIELD_MOVEMENT_STATE,
+    FIELD_NUMBER_OF_DEVICES,
+    FIELD_ONLINE,
+    FIELD_OPERATION,
+    FIELD_POSITION,
+    FIELD_RSSI,
+    FIELD_STATE,
+    FIELD_TYPE,
+    FIELD_VOLTAGE_MODE,
+    FIELD_WIRELESS_MODE,
+    HEARTBEAT_GRACE,
+    INFO,
+    LIVENESS_CHECK_INTERVAL,
     LOG_FILE,
     LOGLEVEL,
+    METRICS_BUCKETS,
+    METRICS_PORT,
     MSG_TYPES,
     MULTICAST_GRP,
+    NAME_STORE_CHECK_INTERVAL,
+    NAME_STORE_FLUSH_DELAY,
+    OPERATIONS,
+    POLL_BUDGET,
+    POLL_FOLLOW_UP_INTERVAL,
+    POLL_FOLLOW_UP_WINDOW,
+    POLL_INTERVAL,
     POSITION,
+    PRIORITY_BULK,
+    PRIORITY_POLL,
+    PRIORITY_STOP,
+    PRIORITY_USER,
     RADIO_MOTOR,
+    READY_DEADLINE,
+    SEND_BURST,
     SEND_PORT,
+    SEND_RATE,
+    SEND_RATE_DECREASE,
+    SEND_RATE_INCREASE,
+    SEND_RATE_MAX,
+    SEND_RATE_MIN,
+    SNAPSHOT_FLUSH_DELAY,
     STATE_DOWN,
     STATE_UP,
     STATUS,
     STOP,
+    STOP_LATENCY_SAMPLES,
+    SWEEP_CONCURRENCY,
+    SWEEP_RESENDS,
+    TRACE_IN,
+    TRACE_OUT,
+    TRACE_SIZE,
+    TRAVEL_SMOOTHING,
+    UDP_MAX_PAYLOAD,
+    UDP_RETRIES,
     UDP_TIMEOUT,
     UP,
     WIFI_BRIDGE,
@@ -76,13 +150,38 @@ from socket import (
     socket,
     timeout,
 )
+from os import (
+    fdopen,
+    fsync,
+    replace,
+    stat,
+    unlink,
+)
+from os.path import (
+    abspath,
+    dirname,
+)
+from tempfile import mkstemp
+from time import (
+    monotonic,
+    time,
+)
 from logging import (
     Logger,
     getLogger,
     FileHandler,
     Formatter,
 )
+from bisect import bisect_left
+from collections import deque
 from datetime import datetime
+from heapq import (
+    heapify,
+    heappop,
+    heappush,
+)
+from itertools import count
+from random import uniform
 
 __all__ = ["Bridge", "RadioMotor", "Driver", "WiFiCurtain", "WiFiMotor", "WiFiReceiver"]
 
@@ -92,6 +191,29 @@ class _Device(ABC):
     Abstract class which represents a SIRO device.
     """
 
+    __slots__ = (
+        '_loglevel',
+        '_driver',
+        '_log',
+        '_mac',
+        '_devicetype',
+        '_name',
+        '_rssi',
+        '_msg_status',
+        '_online',
+        '_last_update',
+        '_loop',
+        '_last_seen',
+        '_grace_period',
+        '_callbacks',
+        '_subscribers',
+        '_pending_changes',
+        '_publish_handle',
+        '__weakref__',
+    )
+    _KEEP_MESSAGE = True
+    _METRICS_LABEL = 'device'
+
     def __init__(
             self,
             mac: str,
@@ -117,13 +239,18 @@ class _Device(ABC):
         self._log: Logger = logger if logger else self._driver.get_logger(loglevel)
         self._mac: str = mac
         self._devicetype: str = devicetype
+        self._loop: AbstractEventLoop = loop if loop else get_event_loop()
         self._name: str = self._read_name_from_file()
         self._rssi: int = 0
         self._msg_status: dict = {}
         self._online: bool = True
         self._last_update: datetime = datetime.fromordinal(1)
-        self._loop: AbstractEventLoop = loop if loop else get_event_loop()
-        self._callbacks = set()
+        self._last_seen: float = self._loop.time()
+        self._grace_period: float = 0
+        self._callbacks: dict = {}
+        self._subscribers: dict = {}
+        self._pending_changes: set = None
+        self._publish_handle: any = None
 
     @property
     def last_update(self) -> datetime:
@@ -135,18 +262,19 @@ class _Device(ABC):
         Set timestamp for last update.
         """
         self._last_update = timestamp
-        self.logger.debug(f"Set last update for device {self._mac} to: {self._last_update}")
+        if self._log.isEnabledFor(DEBUG):
+            self._log.debug(f"Set last update for device {self._mac} to: {self._last_update}")
 
     @property
     def msg_status(self) -> dict:
         """
-        Returns the last status message.
+        Returns the last status message. Devices which do not keep the message rebuild it from the decoded fields.
 
         Returns
         -------
         the dictionary with the last messages.
         """
-        return self._msg_status
+        return self._msg_status if self._KEEP_MESSAGE else self.status
 
     @msg_status.setter
     def msg_status(self, msg: dict) -> None:
@@ -158,10 +286,70 @@ class _Device(ABC):
         msg : Message from the Bridge
         """
         if msg['mac'] == self._mac:
-            self._msg_status = msg
-            self._online = True
+            if self._KEEP_MESSAGE:
+                self._msg_status = msg
+            self._last_seen = self._loop.time()
+            self._set_online(True)
             self.last_update = datetime.now()
 
+    @property
+    def last_seen(self) -> float:
+        """
+        Getter for the time of the last message of the device.
+
+        Returns
+        -------
+        Time of the event loop in seconds.
+        """
+        return self._last_seen
+
+    @property
+    def grace_period(self) -> float:
+        """
+        Getter for the grace period.
+
+        Returns
+        -------
+        Seconds without message until the device is offline. 0 if the device is only offline with its bridge.
+        """
+        return self._grace_period
+
+    @grace_period.setter
+    def grace_period(self, seconds: float) -> None:
+        """
+        Setter for the grace period.
+
+        Parameters
+        ----------
+        seconds : Seconds without message until the device is offline. 0 if the device is only offline with its
+                  bridge.
+        """
+        self._grace_period = seconds
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Getter for a snapshot of the metrics of the device.
+
+        Returns
+        -------
+        Dictionary with the metric names as keys and lists of series as values.
+        """
+        return self._driver.metrics.snapshot(**{self._METRICS_LABEL: self._mac})
+
+    def _set_online(self, online: bool) -> None:
+        """
+        Sets the online state and informs the callbacks about a change.
+
+        Parameters
+        ----------
+        online : The new online state.
+        """
+        if self._online != online:
+            self._online = online
+            self.logger.info(f"Device {self._mac} is {'online' if online else 'offline'}.")
+            self._publish({FIELD_ONLINE})
+
     def _read_name_from_file(self, config_file: str = CONFIGFILE_DEVICE_NAMES) -> str:
         """
         Read readable name from local File.
@@ -174,18 +362,12 @@ class _Device(ABC):
         -------
         The Name of the device
         """
-        try:
-            known_devices = load(open(config_file))
-        except (decoder.JSONDecodeError, FileNotFoundError):
-            self._log.debug(f'{self._mac}: There is no File {config_file}. Setting name to Unknown.')
-            return '-unknown-'
-        else:
-            for known_device in known_devices:
-                if known_device['mac'] == self._mac:
-                    self._log.debug(f'{self._mac}: Name found. Setting name to {known_device["name"]}.')
-                    return known_device['name']
+        name = self._driver.name_store(config_file, self._loop).get(self._mac)
+        if name is None:
             self._log.debug(f'{self._mac}: No Name found. Setting name to Unknown.')
             return '-unknown-'
+        self._log.debug(f'{self._mac}: Name found. Setting name to {name}.')
+        return name
 
     @property
     def name(self) -> str:
@@ -201,7 +383,7 @@ class _Device(ABC):
     @name.setter
     def name(self, device_name: str, config_file: str = CONFIGFILE_DEVICE_NAMES) -> None:
         """
-        Set name of a device and save to local file.
+        Set name of a device. The name is saved to the local file with the next flush of the name store.
 
         Parameters
         ----------
@@ -209,27 +391,7 @@ class _Device(ABC):
         config_file : Path and name of the file.
         """
         self._name = device_name
-
-        device_exists = False
-        try:
-            known_devices = load(open(config_file))
-        except decoder.JSONDecodeError:
-            known_devices = []
-
-        for known_device in known_devices:
-            if known_device['mac'] == self._mac:
-                known_device['name'] = device_name
-                device_exists = True
-        if not device_exists:
-            known_devices.append(
-                {
-                    "mac": self._mac,
-                    "name": self._name,
-                }
-            )
-        name_file = open(config_file, 'w')
-        name_file.write(dumps(known_devices, indent=4))
-        name_file.close()
+        self._driver.name_store(config_file, self._loop).set(self._mac, device_name)
         self._log.debug(f'{self._mac}: Name was set to "{device_name}".')
 
     @property
@@ -304,24 +466,145 @@ class _Device(ABC):
         """
         raise NotImplementedError
 
-    def register_callback(self, callback):
+    def _apply_status(self, data: dict, fields: tuple) -> set:
+        """
+        Applies the values of a status message in one pass over a table of fields.
+
+        Parameters
+        ----------
+        data : The data of the status message.
+        fields : Tuples of message key, attribute name, field name and loglevel.
+
+        Returns
+        -------
+        Set with the names of the changed fields.
+        """
+        changed = set()
+        for key, attribute, field, loglevel in fields:
+            if key in data and getattr(self, attribute) != data[key]:
+                setattr(self, attribute, data[key])
+                changed.add(field)
+                if self._log.isEnabledFor(loglevel):
+                    self._log.log(loglevel, f"Device {self._mac} got update for {key}: {data[key]}.")
+        return changed
+
+    def register_callback(self, callback, fields: set = None, executor: bool = False):
         """
         Register callback, called when Roller changes state.
+
+        Parameters
+        ----------
+        callback : Function or coroutine function without arguments.
+        fields : Names of the fields the callback is interested in (optional). Without fields every change counts.
+        executor : True for running a slow function in the default executor instead of the event loop.
         """
-        self._callbacks.add(callback)
+        self._callbacks[callback] = (frozenset(fields) if fields else None, executor)
 
     def remove_callback(self, callback):
         """
         Remove previously registered callback.
         """
-        self._callbacks.discard(callback)
+        self._callbacks.pop(callback, None)
+
+    def subscribe(self, callback, fields: set = None, executor: bool = False):
+        """
+        Register callback, called with the device and the set of changed fields when the device changes state.
 
-    async def publish_updates(self):
+        Parameters
+        ----------
+        callback : Function or coroutine function with the device and the changed fields as arguments.
+        fields : Names of the fields the callback is interested in (optional), e.g. FIELD_POSITION,
+                 FIELD_MOVEMENT_STATE, FIELD_BATTERY, FIELD_RSSI or FIELD_ONLINE. Without fields every change counts.
+        executor : True for running a slow function in the default executor instead of the event loop.
         """
-        Schedule call all registered callbacks.
+        self._subscribers[callback] = (frozenset(fields) if fields else None, executor)
+
+    def unsubscribe(self, callback):
         """
-        for callback in self._callbacks:
-            callback()
+        Remove previously subscribed callback.
+        """
+        self._subscribers.pop(callback, None)
+
+    def _publish(self, changed: set) -> None:
+        """
+        Collects changed fields and schedules one notification for the next iteration of the event loop, so all
+        changes of one iteration are published together.
+
+        Parameters
+        ----------
+        changed : Names of the changed fields.
+        """
+        if self._pending_changes is None:
+            self._pending_changes = set(changed)
+        else:
+            self._pending_changes |= changed
+        if not self._publish_handle:
+            self._publish_handle = self._loop.call_soon(self._publish_pending)
+
+    def _publish_pending(self) -> None:
+        """
+        Publishes the collected changes.
+        """
+        self._publish_handle = None
+        changed = frozenset(self._pending_changes)
+        self._pending_changes = None
+        self._notify(changed)
+
+    def _notify(self, changed: frozenset) -> list:
+        """
+        Calls the callbacks interested in the changed fields. Coroutines are started as tasks and executor callbacks
+        are started in the default executor, so a slow callback does not hold back the others.
+
+        Parameters
+        ----------
+        changed : Names of the changed fields.
+
+        Returns
+        -------
+        List of the started tasks and executor futures.
+        """
+        started = []
+        for callbacks, arguments in ((self._callbacks, ()), (self._subscribers, (self, changed))):
+            for callback, (fields, executor) in list(callbacks.items()):
+                if fields is not None and fields.isdisjoint(changed):
+                    continue
+                if executor:
+                    started.append(self._loop.run_in_executor(None, callback, *arguments))
+                    continue
+                try:
+                    result = callback(*arguments)
+                except Exception:
+                    self._log.exception(f"Callback of device {self._mac} failed.")
+                    continue
+                if isawaitable(result):
+                    started.append(ensure_future(result, loop=self._loop))
+        for future in started:
+            future.add_done_callback(self._callback_done)
+        return started
+
+    def _callback_done(self, future: Future) -> None:
+        """
+        Logs the failure of an asynchronous callback.
+
+        Parameters
+        ----------
+        future : The task or executor future of the callback.
+        """
+        if not future.cancelled() and future.exception():
+            self._log.error(f"Callback of device {self._mac} failed: {future.exception()!r}")
+
+    async def publish_updates(self, changed: frozenset = frozenset()):
+        """
+        Call all registered callbacks and wait for the asynchronous ones.
+
+        Parameters
+        ----------
+        changed : Names of the changed fields, passed to the subscribers. Callbacks registered for other fields
+                  are not called.
+        """
+        started = self._notify(changed)
+        if started:
+            await wait(started)
 
 
 class Bridge(_Device):
@@ -330,6 +613,39 @@ class Bridge(_Device):
     controllable devices.
     """
 
+    __slots__ = (
+        '_access_token',
+        '_bridge_address',
+        '_callback_address',
+        '_protocol_version',
+        '_firmware',
+        '_token',
+        '_transport',
+        '_protocol',
+        '_current_state',
+        '_devices',
+        '_number_of_devices',
+        '_key_accepted',
+        '_msg_device_list',
+        '_msg_callback',
+        '_scheduler',
+        '_poller',
+        '_liveness_handle',
+        '_ready',
+        '_ready_handle',
+        '_unconfirmed',
+        '_sweep_task',
+        '_snapshot_store',
+    )
+
+    _METRICS_LABEL = 'bridge'
+
+    _STATUS_FIELDS = (
+        ('currentState', '_current_state', FIELD_STATE, DEBUG),
+        ('numberOfDevices', '_number_of_devices', FIELD_NUMBER_OF_DEVICES, INFO),
+        ('RSSI', '_rssi', FIELD_RSSI, INFO),
+    )
+
     # noinspection PyTypeChecker
     def __init__(
             self,
@@ -354,7 +670,6 @@ class Bridge(_Device):
         self._access_token: str = access_token
         self._bridge_address: str = bridge_address
         self._callback_address: str = callback_address if callback_address else self._driver.ip
-        self._sock: socket = ''
         self._protocol_version = ''
         self._firmware: str = ''
         self._token: str = ''
@@ -362,50 +677,264 @@ class Bridge(_Device):
         self._protocol: any = None
         self._rssi: int = 0
         self._current_state: int = 0
-        self._devices: list = []
+        self._devices: dict = {}
         self._number_of_devices: int = 0
         self._key_accepted: bool = True
 
         self._msg_device_list: dict = {}
         self._msg_callback: dict = {}
+        self._scheduler: _OutboundScheduler = _OutboundScheduler(self._transmit, self._loop, self.logger)
+        self._poller: _StatusPoller = _StatusPoller(self, self._loop)
+        self._grace_period: float = HEARTBEAT_GRACE
+        self._liveness_handle: any = None
+        self._ready: Future = self._loop.create_future()
+        self._ready_handle: any = None
+        self._unconfirmed: set = set()
+        self._sweep_task: any = None
+        self._snapshot_store: _SnapshotStore = None
         self.logger.info(f"Init for device {self._mac} done.")
 
-    async def run(self) -> None:
+    async def run(self, ready_deadline: float = READY_DEADLINE) -> None:
+        """
+        Starting the Bridge. The initial status of the devices is requested in the background, see ready.
+
+        Parameters
+        ----------
+        ready_deadline : Seconds after which ready is resolved, even if not all devices confirmed their status.
+        """
+        await self.listen(self._loop)
+        self._apply_device_list(*await self._async_init_device_list())
+        self._start()
+        self._begin_sweep()
+        self._ready_handle = self._loop.call_later(ready_deadline, self._resolve_ready)
+        self._sweep_task = self._loop.create_task(self._initial_sweep())
+        self.logger.info(f"Bridge {self._mac} is running.")
+
+    async def warm_start(self, snapshot: dict, key: str, ready_deadline: float = READY_DEADLINE) -> None:
         """
-        Starting the Bridge.
+        Starting the Bridge from a snapshot. The devices are created with their last known state at once, without
+        waiting for the bridge. The device list, the token and the state of the devices are reconciled with the
+        bridge in the background, see ready.
+
+        Parameters
+        ----------
+        snapshot : Snapshot of the bridge, see snapshot.
+        key : The key used for authentication, for a new token of the bridge.
+        ready_deadline : Seconds after which ready is resolved, even if not all devices confirmed their status.
         """
-        self._sock: socket = self._driver.socket
-        self._msg_device_list, self._bridge_address = self._init_device_list()
-        self._mac = self._msg_device_list["mac"]
-        self._protocol_version = self._msg_device_list['ProtocolVersion']
-        self._firmware = self._msg_device_list['fwVersion']
-        self._number_of_devices = len(self._msg_device_list['data']) - 1
         await self.listen(self._loop)
+        self._apply_device_list(snapshot['device_list'], snapshot['addr'])
+        self._start()
+        for mac, state in snapshot['devices'].items():
+            device = self._devices.get(mac)
+            if device:
+                device.restore(state)
+        self._unconfirmed = set(self._devices)
+        self._ready_handle = self._loop.call_later(ready_deadline, self._resolve_ready)
+        self._sweep_task = self._loop.create_task(self._reconcile(key))
+        self.logger.info(f"Bridge {self._mac} is running from snapshot.")
+
+    def _apply_device_list(self, message: dict, address: str) -> None:
+        """
+        Takes over the information of the bridge from the device list message.
+
+        Parameters
+        ----------
+        message : The device list message of the bridge.
+        address : IP address of the bridge.
+        """
+        self._msg_device_list = message
+        self._bridge_address = address
+        self._mac = message['mac']
+        self._token = message['token']
+        self._protocol_version = message['ProtocolVersion']
+        self._firmware = message['fwVersion']
+        self._number_of_devices = len(message['data']) - 1
+
+    def _start(self) -> None:
+        """
+        Registers the bridge at the driver, starts the liveness check and creates the devices.
+        """
+        self._driver.register_bridge(self)
+        self._liveness_handle = self._loop.call_later(LIVENESS_CHECK_INTERVAL, self._check_liveness)
+        self._driver.metrics.add_collector(self._collect_metrics)
         self.devices = self._msg_device_list['data']
+
+    def _begin_sweep(self) -> None:
+        """
+        Requests the status of the bridge and marks all devices as not confirmed for the initial status sweep.
+        """
         self.ask_for_status_update()
-        self.logger.info(f"Bridge {self._mac} is running.")
+        self._unconfirmed = set(self._devices)
+
+    async def _reconcile(self, key: str) -> None:
+        """
+        Reconciles a bridge started from a snapshot. The device list is read again, the access token is renewed if
+        the bridge has a new token, devices which were removed from the bridge are dropped and new ones are created.
+        If the bridge does not answer at its known address, it is searched on the network by its mac. Finally the
+        state of all devices is requested.
+
+        Parameters
+        ----------
+        key : The key used for authentication.
+        """
+        try:
+            message, address = await self._async_init_device_list()
+        except AsyncTimeoutError:
+            message, address = await self._rediscover()
+        if message is None:
+            self.logger.warning(f'{self._mac}: Bridge not found, keeping the state of the snapshot.')
+            self._sweep_task = None
+            self._resolve_ready()
+            return
+        if message['token'] != self._token:
+            self.access_token = Driver.get_access_token(key, message['token'])
+        self._apply_device_list(message, address)
+        known = {known_device['mac'] for known_device in message['data']}
+        for mac in [mac for mac in self._devices if mac not in known]:
+            self.logger.info(f'{self._mac}: Device with mac {mac} was removed from the bridge.')
+            del self._devices[mac]
+        self.devices = message['data']
+        self._begin_sweep()
+        await self._initial_sweep()
+
+    async def _rediscover(self) -> (dict, str):
+        """
+        Searches the bridge on the network by its mac and reads the device list from its new address.
+
+        Returns
+        -------
+        Tuple of message with known devices and the ip address of the bridge, or of None and None if the bridge
+        was not found or did not answer.
+        """
+        try:
+            for bridge in await self._driver.async_discover_bridges():
+                if bridge['mac'] == self._mac:
+                    self._driver.move_bridge(self, bridge['addr'])
+                    return await self._async_init_device_list()
+        except (AsyncTimeoutError, OSError) as exc:
+            self.logger.info(f'{self._mac}: Search for the bridge failed: {exc!r}')
+        return None, None
+
+    def snapshot(self) -> dict:
+        """
+        Takes a snapshot of the bridge for a warm start.
+
+        Returns
+        -------
+        Dictionary with the address, the token and the device list of the bridge and the state of its devices.
+        """
+        return {
+            'addr': self._bridge_address,
+            'token': self._token,
+            'device_list': self._msg_device_list,
+            'devices': {mac: device.snapshot() for mac, device in self._devices.items()},
+        }
+
+    @property
+    def snapshot_store(self) -> '_SnapshotStore':
+        """
+        Getter for the store, which keeps the snapshot of the bridge.
+
+        Returns
+        -------
+        The snapshot store or None.
+        """
+        return self._snapshot_store
+
+    @snapshot_store.setter
+    def snapshot_store(self, store: '_SnapshotStore') -> None:
+        """
+        Setter for the store, which keeps the snapshot of the bridge. The snapshot is written after status changes.
+
+        Parameters
+        ----------
+        store : The snapshot store.
+        """
+        self._snapshot_store = store
+        store.track(self)
 
-    # noinspection PyMethodMayBeStatic
     async def stop(self):
         """
-        Close socket for gentle shutdown.
+        Unregister the bridge from the driver and close the socket for gentle shutdown, if it was the last bridge.
+        """
+        self._poller.stop()
+        for device in self._devices.values():
+            device._cancel_pending_position()
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            self._sweep_task = None
+        self._resolve_ready()
+        if self._snapshot_store:
+            self._snapshot_store.untrack(self)
+            await self._snapshot_store.async_flush()
+        self._scheduler.close()
+        if self._liveness_handle:
+            self._liveness_handle.cancel()
+            self._liveness_handle = None
+        self._driver.metrics.remove_collector(self._collect_metrics)
+        self._driver.metrics.remove(bridge=self._mac)
+        self._driver.unregister_bridge(self)
+        await self._driver.flush_names()
+        if not self._driver.bridges:
+            self._driver.close_socket()
+
+    @property
+    def ready(self) -> Future:
+        """
+        Getter for the ready signal of the bridge.
+
+        Returns
+        -------
+        Future which is resolved, when all devices confirmed their initial status or the deadline passed. The result
+        is the list of macs of the devices without confirmed status.
+        """
+        return self._ready
+
+    def _resolve_ready(self) -> None:
+        """
+        Resolves the ready signal with the devices, which did not confirm their initial status yet.
         """
-        self._driver.close_socket()
+        if self._ready_handle:
+            self._ready_handle.cancel()
+            self._ready_handle = None
+        if not self._ready.done():
+            if self._unconfirmed:
+                self.logger.warning(f'{self._mac}: No initial status from {len(self._unconfirmed)} devices.')
+            self._ready.set_result(sorted(self._unconfirmed))
+
+    async def _initial_sweep(self) -> None:
+        """
+        Requests the initial status of all devices. Only a few requests are in flight at the same time and the
+        requests are resent, if a device does not answer. A device which reports on its own is not asked again.
+        """
+        in_flight = Semaphore(SWEEP_CONCURRENCY)
+
+        async def request_status(device: _Device) -> None:
+            async with in_flight:
+                if device.mac not in self._unconfirmed:
+                    return
+                try:
+                    await self.request_payload(device.status_payload(), UDP_TIMEOUT, SWEEP_RESENDS, PRIORITY_POLL)
+                except AsyncTimeoutError:
+                    self.logger.info(f'{self._mac}: Device {device.mac} did not answer the status request.')
+
+        await gather(*(request_status(device) for device in list(self._devices.values())))
+        self._sweep_task = None
+        self._resolve_ready()
 
     # noinspection PyUnresolvedReferences
     async def listen(self, loop: AbstractEventLoop):
         """
-        Function for receiving all messages from the bridge.
+        Function for receiving all messages from the bridge. The bridge uses the datagram endpoint of the driver,
+        which routes the messages to the bridge as soon as it is registered.
 
         Parameters
         ----------
         loop : The actual event loop.
         """
-        self._transport, self._protocol = await loop.create_datagram_endpoint(
-            protocol_factory=_SiroUDPListener,
-            sock=self._sock,
-        )
-        self._protocol.register_callback(self.update_devices)
+        self._protocol = await self._driver.start_udp_listener(loop)
+        self._transport = self._driver.transport
 
     @property
     def callback_address(self) -> str:
@@ -437,8 +966,8 @@ class Bridge(_Device):
 
             self.send_payload(payload)
 
-        data, address = self._sock.recvfrom(1024)
-        message = loads(data.decode('utf-8'))
+        data, address = self._driver.receive()
+        message = loads(str(data, 'utf-8'))
 
         if message['msgType'] == MSG_TYPES['LIST_ACK']:
             self.logger.debug(f'{self._mac}: Receive from {address[0]}:{address[1]}: {message}.')
@@ -447,6 +976,23 @@ class Bridge(_Device):
             self.status = message
             return self._init_device_list(waiting_for_response=True)
 
+    async def _async_init_device_list(self) -> (dict, str):
+        """
+        Reads the device list from the bridge without blocking the event loop.
+
+        Returns
+        -------
+        Tuple of message with known devices and the ip address of the bridge.
+        """
+        payload = {
+            'msgType': MSG_TYPES['LIST'],
+            'msgID': self._driver.get_timestamp()
+        }
+
+        message, address = await self.request_payload(payload)
+        self.logger.debug(f'{self._mac}: Receive from {address[0]}:{address[1]}: {message}.')
+        return message, address[0]
+
     @property
     def status(self) -> dict:
         """
@@ -463,26 +1009,13 @@ class Bridge(_Device):
         ----------
         status : Dictionary with the new status values.
         """
-        state_changed = False
         self.msg_status = status
-
-        if self._current_state != status['data']['currentState']:
-            self._current_state = status['data']['currentState']
-            self.logger.debug(f"Bridge {self._mac} got update for currentState: {self._current_state}.")
-            state_changed = True
-        if self._number_of_devices != status['data']['numberOfDevices']:
-            self._number_of_devices = status['data']['numberOfDevices']
-            self.logger.info(f"Bridge {self._mac} got update for numberOfDevices: {self._number_of_devices}.")
-            state_changed = True
-        if self._rssi != status['data']['RSSI']:
-            self._rssi = status['data']['RSSI']
-            self.logger.info(f"Bridge {self._mac} got update for RSSI: {self._rssi}.")
-            state_changed = True
+        changed = self._apply_status(status['data'], self._STATUS_FIELDS)
         if self._number_of_devices == 0:
             raise UserWarning('No devices were found.')
 
-        if state_changed:
-            self._loop.create_task(self.publish_updates())
+        if changed:
+            self._publish(changed)
 
     def ask_for_status_update(self) -> None:
         """
@@ -499,108 +1032,290 @@ class Bridge(_Device):
             "data": data
         }
 
-        self.send_payload(payload)
+        self.send_payload(payload, PRIORITY_POLL)
+
+    def send_payload(self, payload: dict, priority: int = PRIORITY_USER) -> Future:
+        """
+        Queues a payload for sending to the bridge. The outbound scheduler of the bridge sends it as soon as the
+        send rate allows.
+
+        Parameters
+        ----------
+        payload : Message as dictionary.
+        priority : PRIORITY_STOP = 0, PRIORITY_USER = 1, PRIORITY_BULK = 2, PRIORITY_POLL = 3
+
+        Returns
+        -------
+        Future which is resolved with True after sending, False if the sending failed or None if it was dropped.
+        """
+        return self._scheduler.submit(payload, priority)
 
-    def send_payload(self, payload: dict) -> None:
+    def _transmit(self, payload: dict) -> None:
         """
         Sends a payload as JSON string to the bridge.
 
         Parameters
         ----------
-        payload : JSON sting.
+        payload : Message as dictionary.
         """
         if self._bridge_address == '':
             remote_ip = MULTICAST_GRP
         else:
             remote_ip = self._bridge_address
         try:
-            self._sock.sendto(dumps(payload).encode(), (remote_ip, SEND_PORT))
-            self.logger.debug(f'{self._mac}: Send to {remote_ip}:{SEND_PORT}: {dumps(payload)}.')
+            self._driver.metrics.inc(
+                'siro_messages_sent_total', (('bridge', self._mac), ('msg_type', payload['msgType']))
+            )
+            if self._protocol:
+                self._protocol.send(payload, remote_ip)
+            else:
+                self._driver.send_datagram(_encode(payload), (remote_ip, SEND_PORT))
+            if self.logger.isEnabledFor(DEBUG):
+                self.logger.debug(f'{self._mac}: Send to {remote_ip}:{SEND_PORT}: {_encode(payload)}.')
         except Exception:
             raise
 
-    def check_if_device_exist(self, mac: str) -> bool:
+    async def request_payload(
+            self,
+            payload: dict,
+            timeout_: float = UDP_TIMEOUT,
+            retries: int = UDP_RETRIES,
+            priority: int = PRIORITY_USER,
+            submitted=None
+    ) -> (dict, tuple):
         """
-        Check if a device with a specific mac is in the device list.
+        Sends a payload to the bridge and waits for the acknowledgement with the same msgID.
+        Many requests can be pending at the same time.
 
         Parameters
         ----------
-        mac : ID of the device.
+        payload : Message as dictionary.
+        timeout_ : Seconds to wait for the acknowledgement per attempt.
+        retries : Number of resends before giving up.
+        priority : PRIORITY_STOP = 0, PRIORITY_USER = 1, PRIORITY_BULK = 2, PRIORITY_POLL = 3
+        submitted : Function which gets the future of the outbound scheduler for every attempt (optional).
 
         Returns
         -------
-        bool: True if device exists.
+        Tuple of the acknowledgement message and the address of the sender.
         """
-        try:
-            self.get_device_by_mac(mac)
-        except UserWarning:
-            return False
-        else:
-            return True
+        remote_ip = self._bridge_address if self._bridge_address else MULTICAST_GRP
 
-    @property
-    def devices(self) -> list:
+        def send() -> Future:
+            sent = self._scheduler.submit(payload, priority)
+            if submitted:
+                submitted(sent)
+            return sent
+
+        return await self._protocol.request(payload, remote_ip, timeout_, retries, send)
+
+    async def control_devices(
+            self,
+            macs: list,
+            action: int,
+            position: int = 0,
+            mode: int = BULK_MODE_PACED,
+            timeout_: float = UDP_TIMEOUT,
+            retries: int = UDP_RETRIES
+    ) -> dict:
         """
-        Getter for the device list.
-        If the list is not initialized, it will be done.
+        Sends the same control request to a group of devices and waits for the acknowledgements.
+
+        BULK_MODE_PACED keeps only a few requests in flight and spaces them, so the radio of the bridge is not
+        overrun. BULK_MODE_SKEW sends all requests with the minimal spacing, so the devices start moving nearly at
+        the same time.
+
+        Parameters
+        ----------
+        macs : IDs of the devices.
+        action : DOWN = 0, UP = 1, STOP = 2, POSITION = 3, ANGLE = 4, STATUS = 5
+        position : The value of the position or the angle.
+        mode : BULK_MODE_PACED = 0, BULK_MODE_SKEW = 1
+        timeout_ : Seconds to wait for each acknowledgement per attempt.
+        retries : Number of resends per device.
 
         Returns
         -------
-        List of Devices.
+        Dictionary with the lists of macs which were acknowledged ('acked') and which were not ('failed').
         """
-        return self._devices
+        if mode == BULK_MODE_PACED:
+            interval, in_flight = BULK_INTERVAL_PACED, Semaphore(BULK_WINDOW_PACED)
+        elif mode == BULK_MODE_SKEW:
+            interval, in_flight = BULK_INTERVAL_SKEW, Semaphore(max(len(macs), 1))
+        else:
+            raise UserWarning(f'Bulk mode {mode} is not known.')
 
-    @devices.setter
-    def devices(self, device_list: dict = None) -> None:
-        """
-        Reads the message with the device list and creates device instances for each entry.
-        All new devices will be appended to the device list variable.
-        """
-        device_list = device_list if device_list else self._msg_device_list["data"]
+        result = {'acked': [], 'failed': []}
 
-        for known_device in device_list:
-            if known_device['deviceType'] == RADIO_MOTOR:
-                new_device = Driver.device_factory(
-                    known_device['mac'],
-                    known_device['deviceType'],
-                    self,
-                    self._log,
-                    self._loglevel
+        async def command(device: _Device) -> None:
+            payload = device.control_payload(action, position)
+            traced = action != STATUS
+
+            def submitted(sent: Future) -> None:
+                nonlocal traced
+                if traced:
+                    traced = False
+                    device._start_command(payload, action, sent)
+
+            try:
+                message, address = await self.request_payload(
+                    payload,
+                    timeout_,
+                    retries,
+                    PRIORITY_STOP if action == STOP else PRIORITY_BULK,
+                    submitted
                 )
-                if not self.check_if_device_exist(known_device['mac']):
-                    self._devices.append(new_device)
-                    self.logger.info(f'{self._mac}: Created Device with mac {known_device["mac"]}.')
-                else:
-                    self.logger.info(f'{self._mac}: Device with mac {known_device["mac"]} already exists.')
-            elif known_device['deviceType'] == WIFI_BRIDGE:
-                pass
+            except AsyncTimeoutError:
+                result['failed'].append(device.mac)
             else:
-                self.logger.warning(
-                    f'{known_device["mac"]}: Found not supported device of Type {known_device["deviceType"]}. '
-                )
+                result['acked' if 'actionResult' not in message else 'failed'].append(device.mac)
+            finally:
+                in_flight.release()
+
+        if action != STATUS:
+            for mac in macs:
+                if self.check_if_device_exist(mac):
+                    self.get_device_by_mac(mac)._cancel_pending_position()
+
+        commands = []
+        for mac in macs:
+            if not self.check_if_device_exist(mac):
+                self.logger.warning(f'{self._mac}: Device with mac "{mac}" is not known.')
+                result['failed'].append(mac)
+                continue
+            if commands:
+                await sleep(interval)
+            await in_flight.acquire()
+            commands.append(self._loop.create_task(command(self.get_device_by_mac(mac))))
+        await gather(*commands)
+        self.logger.info(f'{self._mac}: Bulk request {action} acknowledged by {len(result["acked"])} devices, '
+                         f'failed for {len(result["failed"])} devices.')
+        return result
+
+    async def move_devices_down(self, macs: list, mode: int = BULK_MODE_PACED) -> dict:
+        """
+        Ask bridge for closing a group of rollers.
 
-    def get_device_by_mac(self, mac: str) -> _Device:
+        Parameters
+        ----------
+        macs : IDs of the devices.
+        mode : BULK_MODE_PACED = 0, BULK_MODE_SKEW = 1
         """
-        Get a single device from the device list by mac.
+        return await self.control_devices(macs, DOWN, mode=mode)
+
+    async def move_devices_up(self, macs: list, mode: int = BULK_MODE_PACED) -> dict:
+        """
+        Ask bridge for opening a group of rollers.
 
         Parameters
         ----------
-        mac : ID of the device.
-
-        Returns
-        -------
-        The device with the given ID.
+        macs : IDs of the devices.
+        mode : BULK_MODE_PACED = 0, BULK_MODE_SKEW = 1
         """
-        for known_device in self._devices:
-            if known_device.mac == mac:
-                return known_device
-        else:
-            raise UserWarning(f'Device with mac "{mac}" is not known.')
+        return await self.control_devices(macs, UP, mode=mode)
 
-    @property
-    def access_token(self) -> str:
+    async def move_devices_stop(self, macs: list, mode: int = BULK_MODE_SKEW) -> dict:
         """
-        Getter for the access token.
+        Ask bridge for stop moving a group of rollers.
+
+        Parameters
+        ----------
+        macs : IDs of the devices.
+        mode : BULK_MODE_PACED = 0, BULK_MODE_SKEW = 1
+        """
+        return await self.control_devices(macs, STOP, mode=mode)
+
+    async def move_devices_to_position(self, macs: list, position: int, mode: int = BULK_MODE_PACED) -> dict:
+        """
+        Ask bridge to move a group of rollers to a given position.
+
+        Parameters
+        ----------
+        macs : IDs of the devices.
+        position : Value of the target position in percent.
+        mode : BULK_MODE_PACED = 0, BULK_MODE_SKEW = 1
+        """
+        return await self.control_devices(macs, POSITION, position, mode)
+
+    def check_if_device_exist(self, mac: str) -> bool:
+        """
+        Check if a device with a specific mac is in the device list.
+
+        Parameters
+        ----------
+        mac : ID of the device.
+
+        Returns
+        -------
+        bool: True if device exists.
+        """
+        return mac in self._devices
+
+    @property
+    def devices(self) -> list:
+        """
+        Getter for the device list.
+        If the list is not initialized, it will be done.
+
+        Returns
+        -------
+        List of Devices.
+        """
+        return list(self._devices.values())
+
+    @devices.setter
+    def devices(self, device_list: dict = None) -> None:
+        """
+        Reads the message with the device list and creates device instances for each entry.
+        Only devices which are not known yet are created and added to the device registry. Devices added after the
+        initial status sweep are asked for their status at once.
+        """
+        device_list = device_list if device_list else self._msg_device_list["data"]
+
+        for known_device in device_list:
+            if known_device['deviceType'] == RADIO_MOTOR:
+                if known_device['mac'] in self._devices:
+                    self.logger.debug(f'{self._mac}: Device with mac {known_device["mac"]} already exists.')
+                else:
+                    device = Driver.device_factory(
+                        known_device['mac'],
+                        known_device['deviceType'],
+                        self,
+                        self._log,
+                        self._loglevel
+                    )
+                    self._devices[known_device['mac']] = device
+                    if self._ready.done():
+                        device.ask_for_status_update()
+                    self.logger.info(f'{self._mac}: Created Device with mac {known_device["mac"]}.')
+            elif known_device['deviceType'] == WIFI_BRIDGE:
+                pass
+            else:
+                self.logger.warning(
+                    f'{known_device["mac"]}: Found not supported device of Type {known_device["deviceType"]}. '
+                )
+
+    def get_device_by_mac(self, mac: str) -> _Device:
+        """
+        Get a single device from the device list by mac.
+
+        Parameters
+        ----------
+        mac : ID of the device.
+
+        Returns
+        -------
+        The device with the given ID.
+        """
+        try:
+            return self._devices[mac]
+        except KeyError:
+            raise UserWarning(f'Device with mac "{mac}" is not known.')
+
+    @property
+    def access_token(self) -> str:
+        """
+        Getter for the access token.
 
         Returns
         -------
@@ -608,6 +1323,19 @@ class Bridge(_Device):
         """
         return self._access_token
 
+    @access_token.setter
+    def access_token(self, access_token: str) -> None:
+        """
+        Setter for the access token, e.g. after the bridge got a new token.
+
+        Parameters
+        ----------
+        access_token : The access token for authentication.
+        """
+        self._access_token = access_token
+        for device in self._devices.values():
+            device._payload_template = b''
+
     @property
     def bridge_address(self) -> str:
         """
@@ -618,6 +1346,18 @@ class Bridge(_Device):
         """
         return self._bridge_address
 
+    @bridge_address.setter
+    def bridge_address(self, addr: str) -> None:
+        """
+        Setter for the IP address of the bridge.
+
+        Parameters
+        ----------
+        addr : IP address as string.
+        """
+        self._bridge_address = addr
+        self.logger.info(f'{self._mac}: Bridge address changed to {addr}.')
+
     @property
     def firmware(self) -> str:
         """
@@ -628,6 +1368,91 @@ class Bridge(_Device):
         """
         return self._firmware
 
+    @property
+    def scheduler(self) -> '_OutboundScheduler':
+        """
+        Getter for the outbound scheduler.
+
+        Returns
+        -------
+        The scheduler which paces the messages to the bridge.
+        """
+        return self._scheduler
+
+    @property
+    def poller(self) -> '_StatusPoller':
+        """
+        Getter for the status poller.
+
+        Returns
+        -------
+        The poller which polls the devices without own reports.
+        """
+        return self._poller
+
+    def start_polling(self, interval: float = POLL_INTERVAL, budget: float = POLL_BUDGET) -> None:
+        """
+        Starts polling the status of the devices, which do not report on their own (uni-directional motors).
+        Bi-directional motors are skipped. Stale and recently commanded devices are polled first and the polls are
+        spread evenly over time.
+
+        Parameters
+        ----------
+        interval : Seconds a device may be silent before it is polled.
+        budget : Share of the send rate of the bridge, which may be used for polling.
+        """
+        self._poller.start(interval, budget)
+
+    def stop_polling(self) -> None:
+        """
+        Stops polling the status of the devices.
+        """
+        self._poller.stop()
+
+    def _alive(self) -> None:
+        """
+        Marks the bridge as alive after receiving any message (e.g. a Heartbeat) from it. If the bridge was offline,
+        the devices without own grace period are online again.
+        """
+        self._last_seen = self._loop.time()
+        if not self._online:
+            self._set_online(True)
+            for device in self._devices.values():
+                if not device.grace_period:
+                    device._set_online(True)
+
+    def _check_liveness(self) -> None:
+        """
+        Periodic check of the liveness. The bridge and all its devices are offline, if the bridge was silent for
+        its grace period. A device with an own grace period is offline, if it was silent for that period.
+        """
+        now = self._loop.time()
+        if self._online and now - self._last_seen > self._grace_period:
+            self._set_online(False)
+            for device in self._devices.values():
+                device._set_online(False)
+        elif self._online:
+            for device in self._devices.values():
+                if device.grace_period and device.is_online and now - device.last_seen > device.grace_period:
+                    device._set_online(False)
+        self._liveness_handle = self._loop.call_later(LIVENESS_CHECK_INTERVAL, self._check_liveness)
+
+    def _collect_metrics(self) -> None:
+        """
+        Updates the metrics of the bridge and its devices, which are read on demand.
+        """
+        metrics = self._driver.metrics
+        bridge = (('bridge', self._mac),)
+        metrics.set('siro_send_rate', self._scheduler.rate, bridge)
+        metrics.set('siro_send_queue_length', self._scheduler.queue_length, bridge)
+        metrics.set('siro_writes_acked_total', self._scheduler.acked, bridge)
+        metrics.set('siro_writes_lost_total', self._scheduler.lost, bridge)
+        metrics.set('siro_online', int(self._online), bridge)
+        for mac, device in self._devices.items():
+            labels = bridge + (('device', mac),)
+            metrics.set('siro_online', int(device.is_online), labels)
+            metrics.set('siro_device_rssi', device.rssi, labels)
+
     def update_devices(self, message) -> None:
         """
         Function for updating the devices. The function identifies the device with the mac and
@@ -638,12 +1463,29 @@ class Bridge(_Device):
         message : Message with new device states.
         """
         mac = message['mac']
-        self.logger.debug(f"Received message: {message}")
+        self._alive()
+        metrics = self._driver.metrics
+        bridge = (('bridge', self._mac),)
+        metrics.inc('siro_messages_received_total', bridge + (('msg_type', message['msgType']),))
+        if message['msgType'] == MSG_TYPES['LIST_ACK']:
+            return
+        if message['msgType'] == MSG_TYPES['WRITE_ACK']:
+            stop_latency = self._scheduler.acknowledge(message.get('msgID'))
+            if stop_latency is not None:
+                metrics.observe('siro_stop_latency_seconds', stop_latency, bridge)
         if mac == self._mac:
             self.status = message
-        elif self.check_if_device_exist(mac):
-            device = self.get_device_by_mac(mac)
-            device.status = message
+        else:
+            device = self._devices.get(mac)
+            if device:
+                metrics.inc('siro_device_reports_total', bridge + (('device', mac),))
+                device.status = message
+                if self._snapshot_store:
+                    self._snapshot_store.changed()
+                if mac in self._unconfirmed:
+                    self._unconfirmed.discard(mac)
+                    if not self._unconfirmed:
+                        self._resolve_ready()
 
 
 class _Actuator(_Device, ABC):
@@ -651,6 +1493,8 @@ class _Actuator(_Device, ABC):
     Class that represents a all actuators which could be connected to a Bridge.
     """
 
+    __slots__ = ('_bridge',)
+
     def __init__(self, mac: str, devicetype: str, driver, logger: Logger, loglevel: int, bridge: Bridge):
         """
 
@@ -681,6 +1525,41 @@ class RadioMotor(_Actuator):
     Class that represents a RadioMotor.
     """
 
+    __slots__ = (
+        '_type',
+        '_operation',
+        '_current_position',
+        '_current_angle',
+        '_current_state',
+        '_voltage_mode',
+        '_battery_level',
+        '_wireless_mode',
+        '_last_action',
+        '_movement_state',
+        '_target_position',
+        '_payload_template',
+        '_coalesce_delay',
+        '_coalesce_max_delay',
+        '_coalesce_deadline',
+        '_pending_position',
+        '_pending_handle',
+        '_command',
+        '_travel_rates',
+        '_motion',
+    )
+    _KEEP_MESSAGE = False
+    _STATUS_FIELDS = (
+        ('type', '_type', FIELD_TYPE, DEBUG),
+        ('operation', '_operation', FIELD_OPERATION, DEBUG),
+        ('currentPosition', '_current_position', FIELD_POSITION, INFO),
+        ('currentAngle', '_current_angle', FIELD_ANGLE, DEBUG),
+        ('currentState', '_current_state', FIELD_STATE, INFO),
+        ('voltageMode', '_voltage_mode', FIELD_VOLTAGE_MODE, INFO),
+        ('batteryLevel', '_battery_level', FIELD_BATTERY, INFO),
+        ('wirelessMode', '_wireless_mode', FIELD_WIRELESS_MODE, DEBUG),
+        ('RSSI', '_rssi', FIELD_RSSI, INFO),
+    )
+
     def __init__(self, mac: str, bridge: Bridge, logger: Logger = None, loglevel: int = None) -> None:
         """
         Constructor of the RadioMotor device.
@@ -704,7 +1583,15 @@ class RadioMotor(_Actuator):
         self._last_action = ''
         self._movement_state = ''
         self._target_position = -1
-        self.ask_for_status_update()
+        self._payload_template: bytes = b''
+        self._coalesce_delay: float = 0
+        self._coalesce_max_delay: float = 0
+        self._coalesce_deadline: float = 0
+        self._pending_position: int = None
+        self._pending_handle: any = None
+        self._command: _CommandTrace = None
+        self._travel_rates: list = [0.0, 0.0]  # percent per second for opening and closing
+        self._motion: tuple = None
         self.logger.info(f"Init for device {self._mac} is done.")
 
     @property
@@ -720,6 +1607,21 @@ class RadioMotor(_Actuator):
         ----------
         target_position : Position the roller should move to in percent.
         """
+        if self._update_movement_state(target_position):
+            self._publish({FIELD_MOVEMENT_STATE})
+
+    def _update_movement_state(self, target_position: int) -> bool:
+        """
+        Derives the movement state from the target position and the actual position.
+
+        Parameters
+        ----------
+        target_position : Position the roller should move to in percent.
+
+        Returns
+        -------
+        True if the movement state changed.
+        """
         state_changed = False
 
         if target_position > self.position:
@@ -745,9 +1647,9 @@ class RadioMotor(_Actuator):
                     state_changed = True
 
         if state_changed:
-            self._loop.create_task(self.publish_updates())
             self.logger.info(f"Device {self._mac} got update for movement state: "
                              f"{self._movement_state}: {CURRENT_STATE['StateRev'][self._movement_state]}")
+        return state_changed
 
     def _control_device(self, action: int, position: int = 0) -> None:
         """
@@ -758,204 +1660,1666 @@ class RadioMotor(_Actuator):
         action : DOWN = 0, UP = 1, STOP = 2, POSITION = 3, ANGLE = 4, STATUS = 5
         position : The value of the position or the angle.
         """
-
-        if action == DOWN:
-            self._target_position = 100
-            self.movement_state = self._target_position
-        if action == UP:
-            self._target_position = 0
-            self.movement_state = self._target_position
+        if action not in (POSITION, STATUS):
+            self._cancel_pending_position()
         if action == STOP:
-            self._target_position = -1
-        if action == STATUS:
-            self._target_position = self.position
-            self.movement_state = self._target_position
-        if action == POSITION:
-            self._target_position = position
-            data = {'targetPosition': position}
+            priority = PRIORITY_STOP
+        elif action == STATUS:
+            priority = PRIORITY_POLL
         else:
-            data = {'operation': action}
-
-        payload = {
-            "msgType": MSG_TYPES['WRITE'],
-            "mac": self.mac,
-            "deviceType": self.devicetype,
-            "AccessToken": self._bridge.access_token,
-            "msgID": Driver.get_timestamp(),
-            "data": data
-        }
-        self._bridge.send_payload(payload)
+            priority = PRIORITY_USER
+        payload = self.control_payload(action, position)
+        sent = self._bridge.send_payload(payload, priority)
+        if action != STATUS:
+            self._start_command(payload, action, sent)
 
-    @property
-    def status(self) -> dict:
+    def _start_command(self, payload: dict, action: int, sent: Future) -> None:
         """
-        Get the values of the status variable.
-        """
-        return self._msg_status
+        Starts the trace of a control request. A not finished trace of an earlier request is reported as it is.
 
-    @status.setter
-    def status(self, status: dict) -> None:
-        """
-        Set the values of the status variables on base of the given message.
         Parameters
         ----------
-        status : Dictionary with new values.
+        payload : The payload of the request.
+        action : DOWN = 0, UP = 1, STOP = 2, POSITION = 3, ANGLE = 4
+        sent : Future of the outbound scheduler, which is resolved after sending.
         """
-        state_changed = False
-        self.msg_status = status
-        try:
-            if self._type != status['data']['type']:
-                self._type = status['data']['type']
-                self.logger.debug(f"Radio {self._mac} got update for type: {self._type}.")
-                state_changed = True
-            if self._operation != status['data']['operation']:
-                self._operation = status['data']['operation']
-                self.logger.debug(f"Device {self._mac} got update for operation: {self._operation}.")
-                state_changed = True
-            if self.position != status['data']['currentPosition']:
-                self.position = status['data']['currentPosition']
-                if status['msgType'] == MSG_TYPES['REPORT']:
-                    self._target_position = self.position
-                    self.movement_state = self._target_position
-                self.logger.info(f"Device {self._mac} got update for currentPosition: {self.position}.")
-                state_changed = True
-            if self._current_angle != status['data']['currentAngle']:
-                self._current_angle = status['data']['currentAngle']
-                self.logger.debug(f"Device {self._mac} got update for currentAngle: {self._current_angle}.")
-                state_changed = True
-            if self._current_state != status['data']['currentState']:
-                self._current_state = status['data']['currentState']
-                self.logger.info(f"Device {self._mac} got update for currentState: {self._current_state}.")
-                state_changed = True
-            if self._voltage_mode != status['data']['voltageMode']:
-                self._voltage_mode = status['data']['voltageMode']
-                self.logger.info(f"Device {self._mac} got update for voltageMode: {self._voltage_mode}.")
-                state_changed = True
-            if self._battery_level != status['data']['batteryLevel']:
-                self._battery_level = status['data']['batteryLevel']
-                self.logger.info(f"Device {self._mac} got update for batteryLevel: {self._battery_level}.")
-                state_changed = True
-            if self._wireless_mode != status['data']['wirelessMode']:
-                self._wireless_mode = status['data']['wirelessMode']
-                self.logger.debug(f"Device {self._mac} got update for wirelessMode: {self._wireless_mode}.")
-                state_changed = True
-            if self._rssi != status['data']['RSSI']:
-                self._rssi = status['data']['RSSI']
-                self.logger.info(f"Device {self._mac} got update for RSSI: {self._rssi}.")
-                state_changed = True
-            if self._last_action != status['msgType']:
-                self._last_action = status['msgType']
-                self.logger.debug(f"Device {self._mac} got update for msgType: {self._last_action}.")
-                state_changed = True
-
-            if state_changed:
-                self._loop.create_task(self.publish_updates())
-        except Exception:
-            raise
+        if self._command:
+            self._driver._command_finished(self, self._command)
+        self._motion = None
+        command = _CommandTrace(payload['msgID'], action, self._target_position, self._current_position,
+                                self._loop.time())
+        self._command = command
+        sent.add_done_callback(lambda future: self._command_sent(command, future))
 
-    def ask_for_status_update(self) -> None:
-        """
-        Ask bridge for an status update of the roller.
+    def _command_sent(self, command: '_CommandTrace', sent: Future) -> None:
         """
-        self._control_device(STATUS)
+        Records the sending of a traced request. The trace is dropped, if the request was not sent.
 
-    def move_down(self) -> None:
-        """
-        Ask bridge for closing the roller.
-        """
-        self._control_device(DOWN)
+        Parameters
+        ----------
+        command : The trace of the request.
+        sent : Future of the outbound scheduler.
+        """
+        if self._command is not command:
+            return
+        if not sent.result():
+            self._command = None
+            return
+        command.sent = self._loop.time()
+        self._observe_command('siro_command_queue_seconds', command, command.sent)
+        self._bridge.poller.commanded(self._mac)
+        if command.action != STOP and command.target not in (-1, self._current_position):
+            self._motion = (command.sent, self._current_position, command.target)
+
+    def _learn_travel_rate(self) -> None:
+        """
+        Learns the travel rate of the direction of the current movement from the distance and the time since the
+        start of the movement or the previous Report. The rate is smoothed over the movements.
+        """
+        started, position, target = self._motion
+        now = self._loop.time()
+        closing = target > position
+        travelled = abs(self._current_position - position)
+        if travelled and now > started:
+            sample = travelled / (now - started)
+            rate = self._travel_rates[closing]
+            self._travel_rates[closing] = sample if not rate else rate + TRAVEL_SMOOTHING * (sample - rate)
+        if self._current_position == target or closing != (target > self._current_position):
+            self._motion = None
+        else:
+            self._motion = (now, self._current_position, target)
 
-    def move_up(self) -> None:
+    def _interpolate(self) -> (float, float):
         """
-        Ask bridge for opening the roller.
+        Interpolates the position of a moving device with the learned travel rate.
+
+        Returns
+        -------
+        Tuple of the interpolated position and the travel rate, or None if the device is not moving or the rate of
+        the direction is not learned yet.
         """
-        self._control_device(UP)
+        if self._motion is None:
+            return None
+        started, position, target = self._motion
+        closing = target > position
+        rate = self._travel_rates[closing]
+        if not rate:
+            return None
+        travelled = rate * (self._loop.time() - started)
+        if closing:
+            return min(target, position + travelled), rate
+        return max(target, position - travelled), rate
 
-    def move_stop(self) -> None:
+    def snapshot(self) -> dict:
         """
-        Ask bridge for stop moving the roller.
+        Takes a snapshot of the state of the roller for a warm start.
+
+        Returns
+        -------
+        Dictionary with the last status data and the learned travel times.
         """
-        self._control_device(STOP)
+        return {'status': self.status['data'], 'travel_times': self.travel_times}
 
-    def move_to_position(self, position: int) -> None:
+    def restore(self, snapshot: dict) -> None:
         """
-        Ask bridge to move the roller to a given position.
+        Restores the state of the roller from a snapshot, without informing the callbacks.
 
         Parameters
         ----------
-        position : Value of the target position in percent.
+        snapshot : Snapshot of the roller, see snapshot.
         """
-        self._control_device(POSITION, position)
+        self._apply_status(snapshot['status'], self._STATUS_FIELDS)
+        self._target_position = self._current_position
+        self._update_movement_state(self._target_position)
+        self.travel_times = snapshot['travel_times']
 
     @property
-    def firmware(self) -> str:
+    def wireless_mode(self) -> int:
         """
-        Getter for the firmware version.
+        Getter for the wireless mode.
 
         Returns
         -------
-        the firmware version as string.
+        0 for uni-directional, 1 and 2 for bi-directional motors, or an empty string if not known yet.
         """
-        return self._bridge.firmware
+        return self._wireless_mode
 
     @property
-    def position(self) -> int:
+    def interpolated_position(self) -> int:
         """
-        Getter for the actual position of the roller.
+        Getter for the estimated position of a moving roller. The position is interpolated with the learned travel
+        rate between the Reports, so it can be polled without radio traffic.
 
         Returns
         -------
-        the position of the roller in percent.
+        the estimated position in percent, or the last reported position if no estimation is possible.
         """
-        return self._current_position
+        estimate = self._interpolate()
+        if estimate is None:
+            return self._current_position
+        return int(round(estimate[0]))
 
-    @position.setter
-    def position(self, value: int):
+    @property
+    def eta(self) -> float:
         """
-        Setter for the actual position of the roller.
+        Getter for the estimated time until a moving roller reaches its target position.
+
+        Returns
+        -------
+        Seconds until the target position is reached, or None if the roller is not moving or its travel rate is
+        not learned yet.
         """
-        self._current_position = value
+        estimate = self._interpolate()
+        if estimate is None:
+            return None
+        position, rate = estimate
+        return abs(self._motion[2] - position) / rate
 
+    @property
+    def travel_times(self) -> dict:
+        """
+        Getter for the learned travel times.
 
-class WiFiCurtain(_Actuator):
+        Returns
+        -------
+        Dictionary with the seconds for a full opening and closing, None for a direction not learned yet.
+        """
+        opening, closing = self._travel_rates
+        return {
+            'opening': STATE_DOWN / opening if opening else None,
+            'closing': STATE_DOWN / closing if closing else None,
+        }
 
-    def __init__(self, mac: str, bridge: Bridge, logger: Logger = None, loglevel: int = None) -> None:
-        super(WiFiCurtain, self).__init__(mac, WIFI_CURTAIN, bridge._driver, logger, loglevel, bridge)
-        raise NotImplementedError
+    @travel_times.setter
+    def travel_times(self, travel_times: dict) -> None:
+        """
+        Setter for the travel times, e.g. for restoring them. The learning continues from these values.
 
-    @property
-    def status(self) -> dict:
-        return self._msg_status
+        Parameters
+        ----------
+        travel_times : Dictionary with the seconds for a full opening and closing, None for unknown.
+        """
+        self._travel_rates = [
+            STATE_DOWN / travel_times['opening'] if travel_times.get('opening') else 0.0,
+            STATE_DOWN / travel_times['closing'] if travel_times.get('closing') else 0.0,
+        ]
 
+    def _track_command(self, status: dict) -> None:
+        """
+        Advances the trace of the latest request with a received message: the acknowledgement with the same msgID,
+        the first Report with a changed position and the Report with the target position. For STOP requests the
+        first Report after sending is the final one.
 
-class WiFiMotor(_Actuator):
-    def __init__(self, mac: str, bridge: Bridge, logger: Logger = None, loglevel: int = None) -> None:
-        super(WiFiMotor, self).__init__(mac, WIFI_MOTOR, bridge._driver, logger, loglevel, bridge)
-        raise NotImplementedError
+        Parameters
+        ----------
+        status : The received message.
+        """
+        command = self._command
+        if command is None or command.sent is None:
+            return
+        now = self._loop.time()
+        if status['msgType'] == MSG_TYPES['WRITE_ACK']:
+            if command.acked is None and status.get('msgID') == command.msg_id:
+                command.acked = now
+                self._observe_command('siro_command_ack_seconds', command, now)
+            return
+        if status['msgType'] != MSG_TYPES['REPORT']:
+            return
+        if command.moving is None and self._current_position != command.position:
+            command.moving = now
+            self._observe_command('siro_command_movement_seconds', command, now)
+        if command.action == STOP or self._current_position == command.target:
+            command.done = now
+            self._observe_command('siro_command_completion_seconds', command, now)
+            self._command = None
+            self._driver._command_finished(self, command)
+
+    def _observe_command(self, name: str, command: '_CommandTrace', now: float) -> None:
+        """
+        Adds the time since queueing a request to a latency histogram of the device.
 
-    @property
-    def status(self) -> dict:
-        return self._msg_status
+        Parameters
+        ----------
+        name : Name of the histogram.
+        command : The trace of the request.
+        now : Time of the event loop when the stage was reached.
+        """
+        labels = (('bridge', self._bridge.mac), ('device', self._mac), ('action', OPERATIONS[command.action]))
+        self._driver.metrics.observe(name, now - command.queued, labels, COMMAND_BUCKETS)
+
+    def set_coalescing(self, delay: float = COALESCE_DELAY, max_delay: float = COALESCE_MAX_DELAY) -> None:
+        """
+        Enables the coalescing of position requests. A position request is held back for the given delay and
+        replaced by a newer one within that time, so only the latest target is sent to the bridge. The request is
+        sent at the latest after max_delay, even if new positions keep coming.
+
+        Parameters
+        ----------
+        delay : Seconds to wait for a newer position. 0 disables the coalescing.
+        max_delay : Maximum seconds a position request is held back.
+        """
+        self._coalesce_delay = delay
+        self._coalesce_max_delay = max(delay, max_delay)
+        if not delay and self._pending_handle:
+            self._pending_handle.cancel()
+            self._send_pending_position()
+
+    def _coalesce_position(self, position: int) -> None:
+        """
+        Holds back a position request and replaces a not yet sent one.
+
+        Parameters
+        ----------
+        position : Value of the target position in percent.
+        """
+        now = self._loop.time()
+        if self._pending_handle:
+            self._pending_handle.cancel()
+        else:
+            self._coalesce_deadline = now + self._coalesce_max_delay
+        self._pending_position = position
+        self._pending_handle = self._loop.call_at(
+            min(now + self._coalesce_delay, self._coalesce_deadline),
+            self._send_pending_position
+        )
+
+    def _send_pending_position(self) -> None:
+        """
+        Sends the held back position request.
+        """
+        position = self._pending_position
+        self._pending_position = None
+        self._pending_handle = None
+        self._control_device(POSITION, position)
+
+    def _cancel_pending_position(self) -> None:
+        """
+        Drops a held back position request, e.g. when a newer command overrides it.
+        """
+        if self._pending_handle:
+            self._pending_handle.cancel()
+            self._pending_handle = None
+            self._pending_position = None
+            self.logger.debug(f"Device {self._mac} dropped pending position request.")
+
+    def control_payload(self, action: int, position: int = 0) -> dict:
+        """
+        Creates the payload of a control request and sets the target position and the movement state.
+
+        Parameters
+        ----------
+        action : DOWN = 0, UP = 1, STOP = 2, POSITION = 3, ANGLE = 4, STATUS = 5
+        position : The value of the position or the angle.
+
+        Returns
+        -------
+        The payload as dictionary.
+        """
+
+        if action == DOWN:
+            self._target_position = 100
+            self.movement_state = self._target_position
+        if action == UP:
+            self._target_position = 0
+            self.movement_state = self._target_position
+        if action == STOP:
+            self._target_position = -1
+        if action == STATUS:
+            self._target_position = self.position
+            self.movement_state = self._target_position
+        if action == POSITION:
+            self._target_position = position
+            data = {'targetPosition': position}
+            encoded_data = b'{"targetPosition": %d}' % position
+        else:
+            data = {'operation': action}
+            encoded_data = _OPERATION_DATA[action]
+        return self._write_payload(data, encoded_data)
+
+    def status_payload(self) -> dict:
+        """
+        Creates the payload of a status request. Unlike control_payload(STATUS), the target position and the
+        movement state are kept, so a moving roller can be polled.
+
+        Returns
+        -------
+        The payload as dictionary.
+        """
+        return self._write_payload({'operation': STATUS}, _OPERATION_DATA[STATUS])
+
+    def _write_payload(self, data: dict, encoded_data: bytes) -> dict:
+        """
+        Creates the payload of a write request, encoded from the cached template.
+
+        Parameters
+        ----------
+        data : The data of the request.
+        encoded_data : The data as JSON bytes.
+
+        Returns
+        -------
+        The payload as dictionary.
+        """
+        if not self._payload_template:
+            self._payload_template = (
+                '{"msgType": "%s", "mac": "%s", "deviceType": "%s", "AccessToken": "%s", "msgID": "%%s", "data": %%s}'
+                % (MSG_TYPES['WRITE'], self.mac, self.devicetype, self._bridge.access_token)
+            ).encode()
+
+        msg_id = Driver.get_timestamp()
+        payload = _EncodedPayload(
+            self._payload_template % (msg_id.encode(), encoded_data),
+            msgType=MSG_TYPES['WRITE'],
+            mac=self.mac,
+            deviceType=self.devicetype,
+            AccessToken=self._bridge.access_token,
+            msgID=msg_id,
+            data=data,
+        )
+        return payload
+
+    @property
+    def status(self) -> dict:
+        """
+        Get the values of the status variable. The motor keeps only the decoded fields, so the status is rebuilt
+        from them.
+        """
+        return {
+            'msgType': self._last_action,
+            'mac': self._mac,
+            'deviceType': self._devicetype,
+            'data': {key: getattr(self, attribute) for key, attribute, field, loglevel in self._STATUS_FIELDS},
+        }
+
+    @status.setter
+    def status(self, status: dict) -> None:
+        """
+        Set the values of the status variables on base of the given message.
+        Parameters
+        ----------
+        status : Dictionary with new values.
+        """
+        self.msg_status = status
+        changed = self._apply_status(status['data'], self._STATUS_FIELDS)
+        if self._command:
+            self._track_command(status)
+        if self._motion and FIELD_POSITION in changed and status['msgType'] == MSG_TYPES['REPORT']:
+            self._learn_travel_rate()
+        if FIELD_POSITION in changed and status['msgType'] == MSG_TYPES['REPORT']:
+            self._target_position = self.position
+            if self._update_movement_state(self._target_position):
+                changed.add(FIELD_MOVEMENT_STATE)
+        if self._last_action != status['msgType']:
+            self._last_action = status['msgType']
+            if self._log.isEnabledFor(DEBUG):
+                self._log.debug(f"Device {self._mac} got update for msgType: {self._last_action}.")
+            changed.add(FIELD_LAST_ACTION)
+
+        if changed:
+            self._publish(changed)
+
+    def ask_for_status_update(self) -> None:
+        """
+        Ask bridge for an status update of the roller.
+        """
+        self._control_device(STATUS)
+
+    def move_down(self) -> None:
+        """
+        Ask bridge for closing the roller.
+        """
+        self._control_device(DOWN)
+
+    def move_up(self) -> None:
+        """
+        Ask bridge for opening the roller.
+        """
+        self._control_device(UP)
+
+    def move_stop(self) -> None:
+        """
+        Ask bridge for stop moving the roller.
+        """
+        self._control_device(STOP)
+
+    def move_to_position(self, position: int) -> None:
+        """
+        Ask bridge to move the roller to a given position.
+
+        Parameters
+        ----------
+        position : Value of the target position in percent.
+        """
+        if self._coalesce_delay:
+            self._coalesce_position(position)
+        else:
+            self._control_device(POSITION, position)
+
+    @property
+    def firmware(self) -> str:
+        """
+        Getter for the firmware version.
+
+        Returns
+        -------
+        the firmware version as string.
+        """
+        return self._bridge.firmware
+
+    @property
+    def position(self) -> int:
+        """
+        Getter for the actual position of the roller.
+
+        Returns
+        -------
+        the position of the roller in percent.
+        """
+        return self._current_position
+
+    @position.setter
+    def position(self, value: int):
+        """
+        Setter for the actual position of the roller.
+        """
+        self._current_position = value
+
+
+class WiFiCurtain(_Actuator):
+    __slots__ = ()
+
+    def __init__(self, mac: str, bridge: Bridge, logger: Logger = None, loglevel: int = None) -> None:
+        super(WiFiCurtain, self).__init__(mac, WIFI_CURTAIN, bridge._driver, logger, loglevel, bridge)
+        raise NotImplementedError
+
+    @property
+    def status(self) -> dict:
+        return self._msg_status
+
+
+class WiFiMotor(_Actuator):
+    __slots__ = ()
+
+    def __init__(self, mac: str, bridge: Bridge, logger: Logger = None, loglevel: int = None) -> None:
+        super(WiFiMotor, self).__init__(mac, WIFI_MOTOR, bridge._driver, logger, loglevel, bridge)
+        raise NotImplementedError
+
+    @property
+    def status(self) -> dict:
+        return self._msg_status
 
 
 class WiFiReceiver(_Actuator):
+    __slots__ = ()
+
     def __init__(self, mac: str, bridge: Bridge, logger: Logger = None, loglevel: int = None) -> None:
         super(WiFiReceiver, self).__init__(mac, WIFI_RECEIVER, bridge._driver, logger, loglevel, bridge)
         raise NotImplementedError
 
     @property
-    def status(self) -> dict:
-        return self._msg_status
+    def status(self) -> dict:
+        return self._msg_status
+
+
+class _EncodedPayload(dict):
+    """
+    Payload which carries its JSON encoding, so it is serialized only once.
+    """
+    __slots__ = ('encoded',)
+
+    def __init__(self, encoded: bytes, **payload) -> None:
+        """
+        Constructor for the encoded payload.
+
+        Parameters
+        ----------
+        encoded : The payload as JSON encoded bytes.
+        payload : The fields of the payload.
+        """
+        super(_EncodedPayload, self).__init__(**payload)
+        self.encoded: bytes = encoded
+
+
+def _encode(payload: dict) -> bytes:
+    """
+    Returns the JSON encoding of a payload.
+
+    Parameters
+    ----------
+    payload : Message as dictionary.
+
+    Returns
+    -------
+    The payload as JSON encoded bytes.
+    """
+    if isinstance(payload, _EncodedPayload):
+        return payload.encoded
+    return dumps(payload).encode()
+
+
+_OPERATION_DATA = {operation: dumps({'operation': operation}).encode() for operation in OPERATIONS}
+
+
+class _CommandTrace(object):
+    """
+    Lifecycle of a control request, identified by its msgID. The stages are stored as times of the event loop:
+    queued, sent, acknowledged, first Report with a movement and the Report with the final position.
+    """
+
+    __slots__ = ('msg_id', 'action', 'target', 'position', 'wall_clock', 'queued', 'sent', 'acked', 'moving', 'done')
+
+    def __init__(self, msg_id: str, action: int, target: int, position: int, queued: float) -> None:
+        """
+        Constructor for the trace of a command.
+
+        Parameters
+        ----------
+        msg_id : The msgID of the request.
+        action : DOWN = 0, UP = 1, STOP = 2, POSITION = 3, ANGLE = 4
+        target : Target position in percent, -1 for STOP.
+        position : Position of the device when the request was queued.
+        queued : Time of the event loop when the request was queued.
+        """
+        self.msg_id: str = msg_id
+        self.action: int = action
+        self.target: int = target
+        self.position: int = position
+        self.wall_clock: float = time()
+        self.queued: float = queued
+        self.sent: float = None
+        self.acked: float = None
+        self.moving: float = None
+        self.done: float = None
+
+    def as_dict(self) -> dict:
+        """
+        Returns the trace as span, with the stages as UNIX timestamps.
+
+        Returns
+        -------
+        Dictionary with msgID, action, target and the timestamps of the stages, None for stages not reached.
+        """
+        offset = self.wall_clock - self.queued
+        return {
+            'msgID': self.msg_id,
+            'action': OPERATIONS[self.action],
+            'target': self.target,
+            'queued': self.wall_clock,
+            'sent': self.sent + offset if self.sent is not None else None,
+            'acked': self.acked + offset if self.acked is not None else None,
+            'moving': self.moving + offset if self.moving is not None else None,
+            'done': self.done + offset if self.done is not None else None,
+        }
+
+
+class _JSONStore(object):
+    """
+    Base class for local JSON files, which are changed by the driver. Changes are collected for a delay and written
+    at once in an executor. The file is replaced atomically, so it is never left half written.
+    """
+
+    def __init__(
+            self,
+            config_file: str,
+            flush_delay: float,
+            loop: AbstractEventLoop = None,
+            logger: Logger = None
+    ) -> None:
+        """
+        Constructor for the store.
+
+        Parameters
+        ----------
+        config_file : Path and name of the file.
+        flush_delay : Seconds to collect changes before writing the file.
+        loop : Asyncio event loop (optional).
+        logger : Logging instance (optional).
+        """
+        self._config_file: str = config_file
+        self._flush_delay: float = flush_delay
+        self._loop: AbstractEventLoop = loop if loop else get_event_loop()
+        self._log: Logger = logger if logger else getLogger(__name__)
+        self._mtime: int = None
+        self._dirty: bool = False
+        self._writing: int = 0
+        self._handle: any = None
+        self._lock: Lock = None
+
+    def _read(self) -> any:
+        """
+        Reads the content of the file.
+
+        Returns
+        -------
+        The parsed JSON content or None, if the file does not exist or is not valid.
+        """
+        try:
+            with open(self._config_file) as config_file:
+                return load(config_file)
+        except (decoder.JSONDecodeError, FileNotFoundError):
+            return None
+
+    def _changed(self) -> None:
+        """
+        Marks the store as changed and schedules the writing of the file.
+        """
+        self._dirty = True
+        if not self._handle:
+            self._handle = self._loop.call_later(self._flush_delay, self._start_flush)
+
+    def _start_flush(self) -> None:
+        """
+        Starts the delayed flush as task.
+        """
+        self._handle = None
+        self._loop.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self) -> None:
+        """
+        Writes the changes after the delay. If the file can not be written, the flush is scheduled again.
+        """
+        try:
+            await self.async_flush()
+        except OSError as exc:
+            self._log.error(f'Writing of {self._config_file} failed: {exc}. Retrying in {self._flush_delay}s.')
+            self._changed()
+
+    def _content(self) -> str:
+        """
+        Serializes the store. Must be implemented in the subclasses.
+
+        Returns
+        -------
+        The content of the file as JSON string.
+        """
+        raise NotImplementedError
+
+    async def async_flush(self) -> None:
+        """
+        Writes the changes to the file in an executor without blocking the event loop.
+        """
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        if not self._lock:
+            self._lock = Lock()
+        async with self._lock:
+            if not self._dirty:
+                return
+            content = self._content()
+            self._writing += 1
+            try:
+                await self._loop.run_in_executor(None, self._write, content)
+            except OSError:
+                self._dirty = True
+                raise
+            finally:
+                self._writing -= 1
+
+    def flush(self) -> None:
+        """
+        Writes the changes to the file immediately, e.g. when there is no running event loop.
+        """
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        if self._dirty:
+            self._write(self._content())
+
+    def _write(self, content: str) -> None:
+        """
+        Writes the content into a temporary file next to the file and replaces the file with it.
+
+        Parameters
+        ----------
+        content : The content of the file.
+        """
+        handle, temp_file = mkstemp(dir=dirname(abspath(self._config_file)), suffix='.tmp')
+        try:
+            with fdopen(handle, 'w') as config_file:
+                config_file.write(content)
+                config_file.flush()
+                fsync(config_file.fileno())
+            replace(temp_file, self._config_file)
+        except OSError:
+            unlink(temp_file)
+            raise
+        self._mtime = stat(self._config_file).st_mtime_ns
+
+
+class _NameStore(_JSONStore):
+    """
+    Cache of the readable device names from a local JSON file, indexed by mac. The file is read again only if its
+    modification time changed. Changed names are collected for NAME_STORE_FLUSH_DELAY and written at once.
+    """
+
+    def __init__(
+            self,
+            config_file: str = CONFIGFILE_DEVICE_NAMES,
+            loop: AbstractEventLoop = None,
+            logger: Logger = None
+    ) -> None:
+        """
+        Constructor for the name store.
+
+        Parameters
+        ----------
+        config_file : Path and name of the file.
+        loop : Asyncio event loop (optional).
+        logger : Logging instance (optional).
+        """
+        super(_NameStore, self).__init__(config_file, NAME_STORE_FLUSH_DELAY, loop, logger)
+        self._names: dict = {}
+        self._checked: float = None
+
+    def _refresh(self) -> None:
+        """
+        Reads the file again, if its modification time changed. The modification time is checked at most once per
+        NAME_STORE_CHECK_INTERVAL.
+        """
+        now = monotonic()
+        if self._checked is not None and now - self._checked < NAME_STORE_CHECK_INTERVAL:
+            return
+        self._checked = now
+        try:
+            mtime = stat(self._config_file).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._mtime and not self._dirty and not self._writing:
+            self._mtime = mtime
+            self._names = self._load()
+
+    def _load(self) -> dict:
+        """
+        Reads the names from the file.
+
+        Returns
+        -------
+        Dictionary with the names by mac.
+        """
+        known_devices = self._read()
+        if not known_devices:
+            return {}
+        return {known_device['mac']: known_device['name'] for known_device in known_devices}
+
+    def get(self, mac: str) -> str:
+        """
+        Get the name of a device.
+
+        Parameters
+        ----------
+        mac : ID of the device.
+
+        Returns
+        -------
+        The name of the device or None if there is no name.
+        """
+        self._refresh()
+        return self._names.get(mac)
+
+    def set(self, mac: str, name: str) -> None:
+        """
+        Set the name of a device. The file is written after NAME_STORE_FLUSH_DELAY, together with all other names
+        set in the meantime.
+
+        Parameters
+        ----------
+        mac : ID of the device.
+        name : Name of the device.
+        """
+        self._refresh()
+        self._names[mac] = name
+        self._changed()
+
+    def _content(self) -> str:
+        """
+        Serializes all names.
+
+        Returns
+        -------
+        The content of the file as JSON string.
+        """
+        self._dirty = False
+        return dumps([{"mac": mac, "name": name} for mac, name in self._names.items()], indent=4)
+
+
+class _SnapshotStore(_JSONStore):
+    """
+    Snapshot of the bridges and the last known state of their devices in a local JSON file, indexed by the mac of
+    the bridge. The snapshots of the tracked bridges are taken only when the file is written, so a status change
+    costs no more than marking the store as changed.
+    """
+
+    def __init__(
+            self,
+            config_file: str = CONFIGFILE_SNAPSHOT,
+            loop: AbstractEventLoop = None,
+            logger: Logger = None
+    ) -> None:
+        """
+        Constructor for the snapshot store.
+
+        Parameters
+        ----------
+        config_file : Path and name of the file.
+        loop : Asyncio event loop (optional).
+        logger : Logging instance (optional).
+        """
+        super(_SnapshotStore, self).__init__(config_file, SNAPSHOT_FLUSH_DELAY, loop, logger)
+        self._snapshots: dict = self._read() or {}
+        self._bridges: list = []
+
+    def get(self, addr: str = '') -> dict:
+        """
+        Get the snapshot of a bridge.
+
+        Parameters
+        ----------
+        addr : IP address of the bridge (optional). Without address a snapshot is returned only if the file holds
+               exactly one bridge, as there is no way to tell several bridges apart.
+
+        Returns
+        -------
+        The snapshot as dictionary or None if there is no matching snapshot.
+        """
+        if not addr:
+            return next(iter(self._snapshots.values())) if len(self._snapshots) == 1 else None
+        for snapshot in self._snapshots.values():
+            if snapshot['addr'] == addr:
+                return snapshot
+        return None
+
+    def track(self, bridge: 'Bridge') -> None:
+        """
+        Adds a bridge, whose snapshot is written with every flush.
+
+        Parameters
+        ----------
+        bridge : The bridge.
+        """
+        if bridge not in self._bridges:
+            self._bridges.append(bridge)
+
+    def untrack(self, bridge: 'Bridge') -> None:
+        """
+        Removes a tracked bridge and keeps its last snapshot.
+
+        Parameters
+        ----------
+        bridge : The bridge.
+        """
+        if bridge in self._bridges:
+            self._bridges.remove(bridge)
+            if bridge.mac:
+                self._snapshots[bridge.mac] = bridge.snapshot()
+                self._changed()
+
+    def changed(self) -> None:
+        """
+        Marks the store as changed. The file is written after SNAPSHOT_FLUSH_DELAY.
+        """
+        if not self._dirty:
+            self._changed()
+
+    def _content(self) -> str:
+        """
+        Serializes the snapshots of all bridges.
+
+        Returns
+        -------
+        The content of the file as JSON string.
+        """
+        self._dirty = False
+        for bridge in self._bridges:
+            if bridge.mac:
+                self._snapshots[bridge.mac] = bridge.snapshot()
+        return dumps(self._snapshots, indent=4)
+
+
+class _StatusPoller(object):
+    """
+    Status polling of the devices of a bridge, which do not report on their own. Every tick polls at most the most
+    overdue device, so the requests are spread evenly over time. A device is due, if it was silent for the poll
+    interval, or for the shorter follow-up interval within the follow-up window after a command. The ticks run at a
+    share of the send rate of the bridge and are skipped while other messages are queued.
+    """
+
+    def __init__(self, bridge: 'Bridge', loop: AbstractEventLoop) -> None:
+        """
+        Constructor for the poller.
+
+        Parameters
+        ----------
+        bridge : The bridge of the polled devices.
+        loop : Asyncio event loop.
+        """
+        self._bridge: Bridge = bridge
+        self._loop: AbstractEventLoop = loop
+        self._interval: float = POLL_INTERVAL
+        self._budget: float = POLL_BUDGET
+        self._handle: any = None
+        self._polled: dict = {}
+        self._commanded: dict = {}
+
+    @property
+    def running(self) -> bool:
+        """
+        Getter for the state of the poller.
+
+        Returns
+        -------
+        True if the poller is started.
+        """
+        return self._handle is not None
+
+    def start(self, interval: float = POLL_INTERVAL, budget: float = POLL_BUDGET) -> None:
+        """
+        Starts the polling.
+
+        Parameters
+        ----------
+        interval : Seconds a device may be silent before it is polled.
+        budget : Share of the send rate of the bridge, which may be used for polling.
+        """
+        self._interval = interval
+        self._budget = budget
+        if not self._handle:
+            self._handle = self._loop.call_soon(self._tick)
+
+    def stop(self) -> None:
+        """
+        Stops the polling.
+        """
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+
+    def commanded(self, mac: str) -> None:
+        """
+        Marks a device as recently commanded, so it is polled in the follow-up interval for a while.
+
+        Parameters
+        ----------
+        mac : ID of the device.
+        """
+        self._commanded[mac] = self._loop.time()
+
+    def _due(self, device: 'RadioMotor', now: float) -> float:
+        """
+        Calculates the time when a device has to be polled next.
+
+        Parameters
+        ----------
+        device : The device.
+        now : Time of the event loop.
+
+        Returns
+        -------
+        Time of the event loop, None if the device does not need polling.
+        """
+        if device.wireless_mode in BI_DIRECTIONAL_MODES:
+            return None
+        interval = self._interval
+        commanded = self._commanded.get(device.mac)
+        if commanded is not None:
+            if now - commanded <= POLL_FOLLOW_UP_WINDOW:
+                interval = min(interval, POLL_FOLLOW_UP_INTERVAL)
+            else:
+                del self._commanded[device.mac]
+        return max(device.last_seen, self._polled.get(device.mac, 0)) + interval
+
+    def _tick(self) -> None:
+        """
+        Polls the most overdue device and schedules the next tick.
+        """
+        now = self._loop.time()
+        scheduler = self._bridge.scheduler
+        if not scheduler.queue_length:
+            overdue = None
+            overdue_since = now
+            for device in self._bridge.devices:
+                due = self._due(device, now)
+                if due is not None and due <= overdue_since:
+                    overdue, overdue_since = device, due
+            if overdue:
+                self._polled[overdue.mac] = now
+                self._bridge.send_payload(overdue.status_payload(), PRIORITY_POLL)
+        self._handle = self._loop.call_later(1 / (self._budget * scheduler.rate), self._tick)
+
+
+class _OutboundScheduler(object):
+    """
+    Outbound queue of a bridge. The messages are sent at the rate of a token bucket. The rate grows additive with
+    every acknowledged write request and shrinks multiplicative, if a write request is not acknowledged (AIMD).
+    Messages with a lower priority value are sent first. STOP requests jump the queue and are sent at once, as long as
+    there are tokens, but they are paced like all other messages once the burst is used up.
+    """
+
+    def __init__(
+            self,
+            transmit,
+            loop: AbstractEventLoop,
+            logger: Logger,
+            rate: float = SEND_RATE,
+            burst: int = SEND_BURST,
+            ack_timeout: float = UDP_TIMEOUT
+    ) -> None:
+        """
+        Constructor for the scheduler.
+
+        Parameters
+        ----------
+        transmit : Function which sends a payload.
+        loop : Asyncio event loop.
+        logger : Logging instance.
+        rate : Initial number of messages per second.
+        burst : Number of messages which can be sent at once.
+        ack_timeout : Seconds after which a write request without acknowledgement counts as lost.
+        """
+        self._transmit = transmit
+        self._loop: AbstractEventLoop = loop
+        self._log: Logger = logger
+        self._rate: float = rate
+        self._burst: int = burst
+        self._ack_timeout: float = ack_timeout
+        self._tokens: float = burst
+        self._updated: float = loop.time()
+        self._last_decrease: float = 0
+        self._queue: list = []
+        self._sequence = count()
+        self._handle: any = None
+        self._unacked: dict = {}
+        self._stops_queued: dict = {}
+        self._stop_latencies: deque = deque(maxlen=STOP_LATENCY_SAMPLES)
+        self._acked: int = 0
+        self._lost_writes: int = 0
+        self._closed: bool = False
+
+    @property
+    def rate(self) -> float:
+        """
+        Getter for the current send rate.
+
+        Returns
+        -------
+        Messages per second.
+        """
+        return self._rate
+
+    @property
+    def queue_length(self) -> int:
+        """
+        Getter for the number of queued messages.
+
+        Returns
+        -------
+        Number of messages waiting for sending.
+        """
+        return len(self._queue)
+
+    @property
+    def acked(self) -> int:
+        """
+        Getter for the number of acknowledged write requests.
+
+        Returns
+        -------
+        Number of write requests with acknowledgement.
+        """
+        return self._acked
+
+    @property
+    def lost(self) -> int:
+        """
+        Getter for the number of write requests without acknowledgement.
+
+        Returns
+        -------
+        Number of lost write requests.
+        """
+        return self._lost_writes
+
+    @property
+    def stop_latencies(self) -> list:
+        """
+        Getter for the latest STOP latencies, measured from queueing the request until its acknowledgement.
+
+        Returns
+        -------
+        List of latencies in seconds.
+        """
+        return list(self._stop_latencies)
+
+    def submit(self, payload: dict, priority: int = PRIORITY_USER) -> Future:
+        """
+        Queues a payload for sending.
+
+        Parameters
+        ----------
+        payload : Message as dictionary.
+        priority : PRIORITY_STOP = 0, PRIORITY_USER = 1, PRIORITY_BULK = 2, PRIORITY_POLL = 3
+
+        Returns
+        -------
+        Future which is resolved with True after sending, False if the sending failed or the scheduler is closed or
+        None if the payload was dropped for a STOP request to the same device.
+        """
+        sent = self._loop.create_future()
+        if self._closed:
+            sent.set_result(False)
+            return sent
+        if priority == PRIORITY_STOP:
+            self._drop(payload.get('mac'))
+            self._stops_queued.setdefault(payload['msgID'], self._loop.time())
+            if self._handle:
+                self._handle.cancel()
+                self._handle = None
+        heappush(self._queue, (priority, next(self._sequence), payload, sent))
+        if not self._handle:
+            self._drain()
+        return sent
+
+    def _drop(self, mac: str) -> None:
+        """
+        Drops all queued write requests to a device, so no queued movement follows a STOP request.
+
+        Parameters
+        ----------
+        mac : ID of the device.
+        """
+        kept = []
+        for entry in self._queue:
+            priority, sequence, payload, sent = entry
+            if payload.get('mac') == mac and payload['msgType'] == MSG_TYPES['WRITE']:
+                self._stops_queued.pop(payload['msgID'], None)
+                if not sent.done():
+                    sent.set_result(None)
+            else:
+                kept.append(entry)
+        if len(kept) != len(self._queue):
+            heapify(kept)
+            self._queue = kept
+
+    def _drain(self) -> None:
+        """
+        Sends queued messages as long as there are tokens and schedules the next run.
+        """
+        self._handle = None
+        if self._closed:
+            return
+        now = self._loop.time()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+        while self._queue and self._tokens >= 1:
+            self._tokens -= 1
+            priority, sequence, payload, sent = heappop(self._queue)
+            self._send(payload, sent)
+        if self._queue:
+            self._handle = self._loop.call_later((1 - self._tokens) / self._rate, self._drain)
+
+    def _send(self, payload: dict, sent: Future) -> None:
+        """
+        Sends a single payload and starts waiting for the acknowledgement of write requests.
+
+        Parameters
+        ----------
+        payload : Message as dictionary.
+        sent : Future which is resolved after sending.
+        """
+        try:
+            self._transmit(payload)
+        except OSError as exc:
+            self._log.error(f'Sending of message {payload.get("msgID")} failed: {exc}.')
+            if not sent.done():
+                sent.set_result(False)
+            return
+        if not sent.done():
+            sent.set_result(True)
+        if payload['msgType'] == MSG_TYPES['WRITE']:
+            msg_id = payload['msgID']
+            if msg_id in self._unacked:
+                self._unacked[msg_id].cancel()
+            self._unacked[msg_id] = self._loop.call_later(self._ack_timeout, self._lost, msg_id)
+
+    def acknowledge(self, msg_id: str) -> float:
+        """
+        Increases the send rate for an acknowledged write request.
+
+        Parameters
+        ----------
+        msg_id : The msgID of the acknowledged request.
+
+        Returns
+        -------
+        Latency of a STOP request in seconds or None for other requests.
+        """
+        latency = None
+        queued = self._stops_queued.pop(msg_id, None)
+        if queued is not None:
+            latency = self._loop.time() - queued
+            self._stop_latencies.append(latency)
+        handle = self._unacked.pop(msg_id, None)
+        if handle:
+            handle.cancel()
+            self._acked += 1
+            self._rate = min(SEND_RATE_MAX, self._rate + SEND_RATE_INCREASE / self._rate)
+        return latency
+
+    def _lost(self, msg_id: str) -> None:
+        """
+        Decreases the send rate for a write request without acknowledgement. The rate is decreased at most once
+        per acknowledgement timeout, as lost messages mostly come in bursts.
+
+        Parameters
+        ----------
+        msg_id : The msgID of the lost request.
+        """
+        self._unacked.pop(msg_id, None)
+        self._stops_queued.pop(msg_id, None)
+        self._lost_writes += 1
+        now = self._loop.time()
+        if now - self._last_decrease >= self._ack_timeout:
+            self._last_decrease = now
+            self._rate = max(SEND_RATE_MIN, self._rate * SEND_RATE_DECREASE)
+            self._log.info(f'No acknowledgement for message {msg_id}. Send rate decreased to {self._rate:.2f}/s.')
+
+    def close(self) -> None:
+        """
+        Stops all timers of the scheduler and drops the queued messages. Messages submitted afterwards are not sent.
+        """
+        self._closed = True
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        for handle in self._unacked.values():
+            handle.cancel()
+        self._unacked.clear()
+        self._stops_queued.clear()
+        while self._queue:
+            priority, sequence, payload, sent = heappop(self._queue)
+            if not sent.done():
+                sent.set_result(False)
+
+
+class _ProtocolTrace(object):
+    """
+    Ring buffer of the latest inbound and outbound datagrams. The datagrams are stored as raw bytes with a monotonic
+    timestamp, so recording is cheap enough to be always on. The formatting is done only on demand.
+    """
+
+    __slots__ = ('_entries',)
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        """
+        Constructor for the trace.
+
+        Parameters
+        ----------
+        size : Maximum number of stored datagrams.
+        """
+        self._entries: deque = deque(maxlen=size)
+
+    def record(self, direction: str, address: tuple, data: bytes) -> None:
+        """
+        Stores a datagram. The oldest datagram is dropped if the buffer is full.
+
+        Parameters
+        ----------
+        direction : TRACE_IN or TRACE_OUT.
+        address : Address of the sender or the receiver.
+        data : The datagram as bytes.
+        """
+        self._entries.append((monotonic(), direction, address, data))
+
+    def entries(self) -> list:
+        """
+        Returns the stored datagrams.
+
+        Returns
+        -------
+        List of tuples with timestamp, direction, address and data, the oldest first.
+        """
+        return list(self._entries)
+
+    def dump(self) -> str:
+        """
+        Formats the stored datagrams, one per line.
+
+        Returns
+        -------
+        The datagrams as text.
+        """
+        return '\n'.join(
+            f'{timestamp:.6f} {direction} {address[0]}:{address[1]} {data.decode("utf-8", "replace")}'
+            for timestamp, direction, address, data in self._entries
+        )
+
+    def clear(self) -> None:
+        """
+        Drops all stored datagrams.
+        """
+        self._entries.clear()
+
+
+_METRICS = {
+    'siro_datagrams_received_total': ('counter', 'Received datagrams by sender and message type.'),
+    'siro_datagrams_sent_total': ('counter', 'Sent datagrams by receiver and message type.'),
+    'siro_bytes_received_total': ('counter', 'Received bytes by sender.'),
+    'siro_bytes_sent_total': ('counter', 'Sent bytes by receiver.'),
+    'siro_parse_failures_total': ('counter', 'Received datagrams which are no valid messages.'),
+    'siro_requests_total': ('counter', 'Requests waiting for an acknowledgement.'),
+    'siro_request_acks_total': ('counter', 'Requests which were acknowledged.'),
+    'siro_request_retries_total': ('counter', 'Resends of requests without acknowledgement.'),
+    'siro_request_timeouts_total': ('counter', 'Requests which were given up without acknowledgement.'),
+    'siro_request_latency_seconds': (
+        'histogram',
+        'Seconds from the first sending of a request until its acknowledgement.'
+    ),
+    'siro_messages_received_total': ('counter', 'Messages routed to a bridge by message type.'),
+    'siro_messages_sent_total': ('counter', 'Messages sent by a bridge by message type.'),
+    'siro_writes_acked_total': ('counter', 'Write requests of a bridge which were acknowledged.'),
+    'siro_writes_lost_total': ('counter', 'Write requests of a bridge without acknowledgement.'),
+    'siro_stop_latency_seconds': ('histogram', 'Seconds from queueing a STOP request until its acknowledgement.'),
+    'siro_send_rate': ('gauge', 'Current send rate of a bridge in messages per second.'),
+    'siro_send_queue_length': ('gauge', 'Messages waiting in the outbound queue of a bridge.'),
+    'siro_online': ('gauge', 'Whether a bridge or device was seen within its grace period.'),
+    'siro_device_reports_total': ('counter', 'Status messages of a device.'),
+    'siro_device_rssi': ('gauge', 'Last reported signal strength of a device.'),
+    'siro_command_queue_seconds': ('histogram', 'Seconds from queueing a command until sending it.'),
+    'siro_command_ack_seconds': ('histogram', 'Seconds from queueing a command until its acknowledgement.'),
+    'siro_command_movement_seconds': ('histogram', 'Seconds from queueing a command until the first movement.'),
+    'siro_command_completion_seconds': ('histogram', 'Seconds from queueing a command until the final position.'),
+}
+
+
+class _Histogram(object):
+    """
+    Histogram with fixed upper bounds. The counts are stored per bucket and accumulated only for the output.
+    """
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: tuple = METRICS_BUCKETS) -> None:
+        """
+        Constructor for the histogram.
+
+        Parameters
+        ----------
+        bounds : Sorted upper bounds of the buckets.
+        """
+        self.bounds: tuple = bounds
+        self.counts: list = [0] * len(bounds)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Adds a value to the histogram.
+
+        Parameters
+        ----------
+        value : The observed value.
+        """
+        index = bisect_left(self.bounds, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list:
+        """
+        Returns the accumulated counts per upper bound, including the +Inf bucket.
+
+        Returns
+        -------
+        List of tuples with the upper bound and the number of values less than or equal to it.
+        """
+        result = []
+        total = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            total += bucket
+            result.append((bound, total))
+        result.append((float('inf'), self.count))
+        return result
+
+
+class _Metrics(object):
+    """
+    Registry for the counters, gauges and histograms of the driver. A series is identified by the metric name and a
+    tuple of label pairs. Functions registered as collectors are called before every snapshot to update values,
+    which are cheaper to read on demand than to track on every change.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for the registry.
+        """
+        self._values: dict = {}
+        self._histograms: dict = {}
+        self._collectors: list = []
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1) -> None:
+        """
+        Increases a counter.
+
+        Parameters
+        ----------
+        name : Name of the metric.
+        labels : Tuple of label pairs, e.g. (('bridge', mac),).
+        value : Increment.
+        """
+        series = self._values.setdefault(name, {})
+        series[labels] = series.get(labels, 0) + value
+
+    def set(self, name: str, value: float, labels: tuple = ()) -> None:
+        """
+        Sets a gauge.
+
+        Parameters
+        ----------
+        name : Name of the metric.
+        value : The new value.
+        labels : Tuple of label pairs.
+        """
+        self._values.setdefault(name, {})[labels] = value
+
+    def observe(self, name: str, value: float, labels: tuple = (), bounds: tuple = METRICS_BUCKETS) -> None:
+        """
+        Adds a value to a histogram.
+
+        Parameters
+        ----------
+        name : Name of the metric.
+        value : The observed value.
+        labels : Tuple of label pairs.
+        bounds : Upper bounds of the buckets, used when the series is created.
+        """
+        series = self._histograms.setdefault(name, {})
+        histogram = series.get(labels)
+        if histogram is None:
+            histogram = series[labels] = _Histogram(bounds)
+        histogram.observe(value)
+
+    def remove(self, **labels) -> None:
+        """
+        Removes all series with the given labels, e.g. of a stopped bridge.
+
+        Parameters
+        ----------
+        labels : Label values the series must have.
+        """
+        wanted = set(labels.items())
+        for metrics in (self._values, self._histograms):
+            for series in metrics.values():
+                for key in [key for key in series if wanted.issubset(key)]:
+                    del series[key]
+
+    def add_collector(self, collector) -> None:
+        """
+        Register a function without arguments, which is called before every snapshot.
+
+        Parameters
+        ----------
+        collector : Function which updates metrics.
+        """
+        self._collectors.append(collector)
+
+    def remove_collector(self, collector) -> None:
+        """
+        Remove a previously registered collector.
+
+        Parameters
+        ----------
+        collector : Function which updates metrics.
+        """
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def _collect(self) -> None:
+        """
+        Calls all registered collectors.
+        """
+        for collector in self._collectors:
+            collector()
+
+    def snapshot(self, **labels) -> dict:
+        """
+        Returns the current values of all series with the given labels.
+
+        Parameters
+        ----------
+        labels : Label values the series must have, e.g. bridge=mac (optional).
+
+        Returns
+        -------
+        Dictionary with the metric names as keys and lists of series as values. A series is a dictionary with the
+        labels and the value, or with the labels, the buckets, the sum and the count for histograms.
+        """
+        self._collect()
+        wanted = set(labels.items())
+        result = {}
+        for name, series in self._values.items():
+            entries = [
+                {'labels': dict(key), 'value': value} for key, value in series.items() if wanted.issubset(key)
+            ]
+            if entries:
+                result[name] = entries
+        for name, series in self._histograms.items():
+            entries = [
+                {
+                    'labels': dict(key),
+                    'buckets': dict(histogram.cumulative()),
+                    'sum': histogram.sum,
+                    'count': histogram.count,
+                }
+                for key, histogram in series.items() if wanted.issubset(key)
+            ]
+            if entries:
+                result[name] = entries
+        return result
+
+    @staticmethod
+    def _format_labels(labels: tuple) -> str:
+        """
+        Formats label pairs for the Prometheus text format.
+
+        Parameters
+        ----------
+        labels : Tuple of label pairs.
+
+        Returns
+        -------
+        The labels in curly braces or an empty string.
+        """
+        if not labels:
+            return ''
+        pairs = ','.join(
+            '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for key, value in labels
+        )
+        return '{' + pairs + '}'
+
+    def prometheus(self) -> str:
+        """
+        Returns all metrics in the Prometheus text exposition format.
+
+        Returns
+        -------
+        The metrics as text.
+        """
+        self._collect()
+        lines = []
+        for name in sorted(set(self._values) | set(self._histograms)):
+            kind, description = _METRICS.get(name, ('untyped', ''))
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in self._values.get(name, {}).items():
+                lines.append(f'{name}{self._format_labels(labels)} {value}')
+            for labels, histogram in self._histograms.get(name, {}).items():
+                for bound, total in histogram.cumulative():
+                    bucket = labels + (('le', '+Inf' if bound == float('inf') else bound),)
+                    lines.append(f'{name}_bucket{self._format_labels(bucket)} {total}')
+                lines.append(f'{name}_sum{self._format_labels(labels)} {histogram.sum}')
+                lines.append(f'{name}_count{self._format_labels(labels)} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    async def serve(self, host: str = '127.0.0.1', port: int = METRICS_PORT) -> AbstractServer:
+        """
+        Serves the metrics in the Prometheus text format via HTTP, e.g. for scraping.
+
+        Parameters
+        ----------
+        host : Local address to listen on.
+        port : Local port to listen on.
+
+        Returns
+        -------
+        The server, which has to be closed by the caller.
+        """
+        return await start_server(self._handle_scrape, host, port)
+
+    async def _handle_scrape(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """
+        Answers a single HTTP request with the metrics.
+
+        Parameters
+        ----------
+        reader : Stream of the request.
+        writer : Stream of the response.
+        """
+        try:
+            await reader.readuntil(b'\r\n\r\n')
+            body = self.prometheus().encode()
+            writer.write(
+                b'HTTP/1.0 200 OK\r\n'
+                b'Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n'
+                b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n' + body
+            )
+            await writer.drain()
+        except (IncompleteReadError, LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
 
 
 class _SiroUDPListener(DatagramProtocol):
-    def __init__(self):
+    def __init__(self, trace: _ProtocolTrace = None, metrics: _Metrics = None):
         """
         Constructor for the protocol class.
+
+        Parameters
+        ----------
+        trace : Ring buffer for recording the datagrams (optional).
+        metrics : Registry for the metrics of the listener (optional).
         """
+        self._trace: _ProtocolTrace = trace if trace else _ProtocolTrace()
+        self._metrics: _Metrics = metrics if metrics else _Metrics()
         self._transport = None
         self._bridge = None
         self._callbacks = set()
+        self._pending: dict = {}
+        self._collectors: dict = {}
+        self._dispatcher = None
 
     def set_bridge(self, bridge: Bridge) -> None:
         """
@@ -963,38 +3327,180 @@ class _SiroUDPListener(DatagramProtocol):
 
         Parameters
         ----------
-        bridge : Reference to the bridge.
+        bridge : Reference to the bridge.
+        """
+        self._bridge = bridge
+
+    def set_dispatcher(self, dispatcher) -> None:
+        """
+        Setter for the function which routes every received message and the sender address to its bridge.
+
+        Parameters
+        ----------
+        dispatcher : Function with the message and the sender address as arguments.
+        """
+        self._dispatcher = dispatcher
+
+    def connection_made(self, transport) -> None:
+        """
+        Implementation of the connection made method.
+
+        Parameters
+        ----------
+        transport : Transport object for async communication with the socket.
+        """
+        self._transport = transport
+
+    def connection_lost(self, exc) -> None:
+        """
+        Implementation of the connection lost method.
+        """
+        pass
+
+    def datagram_received(self, data, addr) -> None:
+        """
+        Method which is called when a new datagram is received.
+        It calls the bridge to update the corresponding devices.
+
+        Parameters
+        ----------
+        data : Message as bytes
+        addr : Address of the sending bridge
+        """
+        self._trace.record(TRACE_IN, addr, data)
+        address = (('address', addr[0]),)
+        self._metrics.inc('siro_bytes_received_total', address, len(data))
+        try:
+            message = loads(data)
+            msg_type = message['msgType']
+            if not isinstance(msg_type, str):
+                raise TypeError(f'msgType {msg_type!r} is not a string.')
+            msg_id = message.get('msgID')
+            ack = msg_type.endswith('Ack')
+            pending = ack and (msg_id in self._pending or msg_id in self._collectors)
+            routed = isinstance(message.get('mac'), str)
+            if not routed and not pending:
+                raise KeyError('mac')
+        except (ValueError, KeyError, TypeError):
+            self._metrics.inc('siro_parse_failures_total', address)
+            return
+        self._metrics.inc('siro_datagrams_received_total', address + (('msg_type', msg_type),))
+        if ack:
+            response = self._pending.pop(msg_id, None)
+            if response and not response.done():
+                response.set_result((message, addr))
+            collector = self._collectors.get(msg_id)
+            if collector:
+                collector(message, addr)
+        if not routed:
+            return
+        if self._dispatcher:
+            self._dispatcher(message, addr)
+        for callback in self._callbacks:
+            callback(message)
+
+    async def request(
+            self,
+            payload: dict,
+            addr: str,
+            timeout_: float = UDP_TIMEOUT,
+            retries: int = UDP_RETRIES,
+            send=None
+    ) -> (dict, tuple):
+        """
+        Sends a payload and waits for the acknowledgement with the same msgID. The payload is sent again with the
+        same msgID if no acknowledgement is received within the timeout, so a late acknowledgement still matches.
+
+        Parameters
+        ----------
+        payload : Message as dictionary, containing a msgID.
+        addr : IP address of the receiver.
+        timeout_ : Seconds to wait for the acknowledgement per attempt.
+        retries : Number of resends before giving up.
+        send : Function which sends the payload and returns a future resolved after sending (optional).
+               The timeout of an attempt starts when the payload was sent. The request is given up,
+               if the future is resolved with None.
+
+        Returns
+        -------
+        Tuple of the acknowledgement message and the address of the sender.
+        """
+        msg_id = payload['msgID']
+        if msg_id in self._pending:
+            raise UserWarning(f'A request with msgID {msg_id} is already pending.')
+        response = get_event_loop().create_future()
+        self._pending[msg_id] = response
+        address = (('address', addr),)
+        self._metrics.inc('siro_requests_total', address)
+        started = None
+        try:
+            for attempt in range(retries + 1):
+                if attempt:
+                    self._metrics.inc('siro_request_retries_total', address)
+                if send:
+                    if await send() is None:
+                        raise AsyncTimeoutError(f'Request with msgID {msg_id} was dropped.')
+                else:
+                    self.send(payload, addr)
+                if started is None:
+                    started = monotonic()
+                await wait({response}, timeout=timeout_)
+                if response.done():
+                    self._metrics.inc('siro_request_acks_total', address)
+                    self._metrics.observe('siro_request_latency_seconds', monotonic() - started, address)
+                    return response.result()
+            self._metrics.inc('siro_request_timeouts_total', address)
+            raise AsyncTimeoutError(f'No acknowledgement for msgID {msg_id} from {addr}.')
+        finally:
+            self._pending.pop(msg_id, None)
+
+    def add_collector(self, msg_id: str, collector) -> None:
+        """
+        Register a function which gets every acknowledgement with the given msgID, e.g. all answers to a multicast.
+
+        Parameters
+        ----------
+        msg_id : The msgID of the request.
+        collector : Function with the message and the sender address as arguments.
         """
-        self._bridge = bridge
+        self._collectors[msg_id] = collector
 
-    def connection_made(self, transport) -> None:
+    def remove_collector(self, msg_id: str) -> None:
         """
-        Implementation of the connection made method.
+        Remove a previously registered collector.
 
         Parameters
         ----------
-        transport : Transport object for async communication with the socket.
+        msg_id : The msgID of the request.
         """
-        self._transport = transport
+        self._collectors.pop(msg_id, None)
 
-    def connection_lost(self, exc) -> None:
+    @property
+    def pending_requests(self) -> int:
         """
-        Implementation of the connection lost method.
+        Getter for the number of requests waiting for an acknowledgement.
+
+        Returns
+        -------
+        Number of pending requests.
         """
-        pass
+        return len(self._pending)
 
-    def datagram_received(self, data, addr) -> None:
+    def send(self, payload: dict, addr: str) -> None:
         """
-        Method which is called when a new datagram is received.
-        It calls the bridge to update the corresponding devices.
+        Sends a payload as JSON string via the transport of the listener.
 
         Parameters
         ----------
-        data : Message as bytes
-        addr : Address of the sending bridge
+        payload : Message as dictionary.
+        addr : IP address of the receiver.
         """
-        for callback in self._callbacks:
-            callback(loads(data.decode('utf-8')))
+        data = _encode(payload)
+        self._trace.record(TRACE_OUT, (addr, SEND_PORT), data)
+        address = (('address', addr),)
+        self._metrics.inc('siro_bytes_sent_total', address, len(data))
+        self._metrics.inc('siro_datagrams_sent_total', address + (('msg_type', payload['msgType']),))
+        self._transport.sendto(data, (addr, SEND_PORT))
 
     def register_callback(self, callback):
         """
@@ -1012,14 +3518,25 @@ class _SiroUDPListener(DatagramProtocol):
 class Driver(object):
     """Driver class for holding the factories and other tools."""
 
+    _message_ids = count(int(datetime.now().strftime("%Y%m%d%H%M%S%f")[0:17]))
+
     # noinspection PyTypeChecker
     def __init__(self):
         self._bridge: Bridge = None
+        self._bridges: dict = {}
+        self._bridges_by_mac: dict = {}
         self._socket: socket = None
         self._logger: Logger = self.get_logger()
         self._ipaddr: str = None
         self._transport = None
         self._listener: _SiroUDPListener = None
+        self._name_stores: dict = {}
+        self._snapshot_stores: dict = {}
+        self._trace: _ProtocolTrace = _ProtocolTrace()
+        self._metrics: _Metrics = _Metrics()
+        self._command_callbacks: set = set()
+        self._receive_buffer: bytearray = bytearray(UDP_MAX_PAYLOAD)
+        self._receive_view: memoryview = memoryview(self._receive_buffer)
 
     @property
     def driver(self) -> Bridge:
@@ -1042,20 +3559,145 @@ class Driver(object):
         bridge : Bridge Object
         """
         self._bridge = bridge
+        self.register_bridge(bridge)
+
+    @property
+    def bridges(self) -> list:
+        """
+        Getter for all bridges registered at the driver.
+
+        Returns
+        -------
+        List of bridges.
+        """
+        return list(self._bridges_by_mac.values())
 
-    async def start_udp_listener(self, loop: AbstractEventLoop):
+    def get_bridge_by_mac(self, mac: str) -> Bridge:
         """
-        Function for receiving all messages from the bridge.
+        Get a registered bridge by mac.
 
         Parameters
         ----------
-        loop : The actual event loop.
+        mac : ID of the bridge.
+
+        Returns
+        -------
+        The bridge with the given ID.
         """
-        self._transport, self._listener = await loop.create_datagram_endpoint(
-            protocol_factory=_SiroUDPListener,
-            sock=self.socket,
-        )
-        self._listener.register_callback(self._bridge.update_devices)
+        try:
+            return self._bridges_by_mac[mac]
+        except KeyError:
+            raise UserWarning(f'Bridge with mac "{mac}" is not known.')
+
+    def register_bridge(self, bridge: Bridge) -> None:
+        """
+        Register a bridge for receiving the messages sent from its address or mac.
+
+        Parameters
+        ----------
+        bridge : Bridge Object
+        """
+        if bridge.mac:
+            self._bridges_by_mac[bridge.mac] = bridge
+        if bridge.bridge_address:
+            self._bridges[bridge.bridge_address] = bridge
+
+    def unregister_bridge(self, bridge: Bridge) -> None:
+        """
+        Remove a bridge from the routing of incoming messages.
+
+        Parameters
+        ----------
+        bridge : Bridge Object
+        """
+        if self._bridges_by_mac.get(bridge.mac) is bridge:
+            del self._bridges_by_mac[bridge.mac]
+        if self._bridges.get(bridge.bridge_address) is bridge:
+            del self._bridges[bridge.bridge_address]
+        if self._bridge is bridge:
+            self._bridge = None
+
+    def _dispatch(self, message: dict, addr: tuple) -> None:
+        """
+        Routes a received message to the bridge it was sent from. The bridge is looked up by the source address and
+        by the mac, if the bridge got a new address.
+
+        Parameters
+        ----------
+        message : The received message.
+        addr : Address of the sender.
+        """
+        bridge = self._bridges.get(addr[0])
+        if not bridge:
+            bridge = self._bridges_by_mac.get(message.get('mac'))
+            if not bridge:
+                return
+            self.move_bridge(bridge, addr[0])
+        bridge.update_devices(message)
+
+    def move_bridge(self, bridge: Bridge, addr: str) -> None:
+        """
+        Changes the address of a registered bridge, e.g. after it got a new address via DHCP.
+
+        Parameters
+        ----------
+        bridge : Bridge Object
+        addr : The new IP address of the bridge.
+        """
+        if self._bridges.get(bridge.bridge_address) is bridge:
+            del self._bridges[bridge.bridge_address]
+        bridge.bridge_address = addr
+        self._bridges[addr] = bridge
+
+    async def start_udp_listener(self, loop: AbstractEventLoop = None) -> _SiroUDPListener:
+        """
+        Function for receiving all messages from the bridges. The datagram endpoint is created only once and shared
+        by all bridges and asynchronous requests of the driver.
+
+        Parameters
+        ----------
+        loop : The actual event loop (optional).
+
+        Returns
+        -------
+        The listener of the datagram endpoint.
+        """
+        if not self._listener:
+            loop = loop if loop else get_event_loop()
+            self._transport, self._listener = await loop.create_datagram_endpoint(
+                protocol_factory=lambda: _SiroUDPListener(self._trace, self._metrics),
+                sock=self.socket,
+            )
+            self._listener.set_dispatcher(self._dispatch)
+        return self._listener
+
+    @property
+    def transport(self) -> any:
+        """
+        Getter for the transport of the datagram endpoint.
+
+        Returns
+        -------
+        The transport or None if the listener is not started.
+        """
+        return self._transport
+
+    async def _async_request(self, payload: dict, addr: str) -> (dict, tuple):
+        """
+        Sends a payload via the listener and waits for the acknowledgement with the same msgID without blocking
+        the event loop.
+
+        Parameters
+        ----------
+        payload : Message as dictionary.
+        addr : IP address of the receiver.
+
+        Returns
+        -------
+        Tuple of the response message and the address of the sender.
+        """
+        listener = await self.start_udp_listener()
+        return await listener.request(payload, addr)
 
     async def bridge_factory(
             self,
@@ -1063,7 +3705,10 @@ class Driver(object):
             log: Logger = None,
             loop=None,
             addr: str = '',
-            loglevel: int = None
+            loglevel: int = None,
+            wait_ready: bool = False,
+            ready_deadline: float = READY_DEADLINE,
+            snapshot_file: str = None
     ) -> Bridge:
         """
         Factory for getting an bridge object.
@@ -1075,15 +3720,37 @@ class Driver(object):
         loop : AsyncIO event loop (optional).
         addr : IP address of the bridge (optional).
         loglevel : Loglevel for the logger.
+        wait_ready : True for returning only after all devices confirmed their initial status or the deadline passed.
+                     Otherwise the initial status can be awaited with Bridge.ready.
+        ready_deadline : Seconds after which the bridge counts as ready anyway.
+        snapshot_file : Path and name of a snapshot file for a warm start (optional). With a snapshot of the bridge,
+                        the bridge and its devices are created at once from the snapshot and reconciled in the
+                        background. The snapshot is updated while the bridge is running. If the file holds several
+                        bridges, the address is needed for selecting the snapshot.
 
         Returns
         -------
         reference to an bridge object.
         """
-        bridge_info = self.get_bridge_info(addr)
-        access_token = Driver.get_access_token(key, bridge_info['token'])
-        new_bridge = Bridge(access_token, self, log, bridge_info['addr'], loglevel, loop, self.ip)
-        await new_bridge.run()
+        snapshot_store = self.snapshot_store(snapshot_file, loop) if snapshot_file else None
+        snapshot = snapshot_store.get(addr) if snapshot_store else None
+        if snapshot:
+            access_token = Driver.get_access_token(key, snapshot['token'])
+            new_bridge = Bridge(access_token, self, log, snapshot['addr'], loglevel, loop, self.ip)
+            new_bridge.snapshot_store = snapshot_store
+            await new_bridge.warm_start(snapshot, key, ready_deadline)
+        else:
+            bridge_info = await self.async_get_bridge_info(addr)
+            access_token = Driver.get_access_token(key, bridge_info['token'])
+            new_bridge = Bridge(access_token, self, log, bridge_info['addr'], loglevel, loop, self.ip)
+            if snapshot_store:
+                new_bridge.snapshot_store = snapshot_store
+            await new_bridge.run(ready_deadline)
+            if snapshot_store:
+                snapshot_store.changed()
+        if wait_ready:
+            await new_bridge.ready
+        self._bridge = new_bridge
         return new_bridge
 
     @staticmethod
@@ -1129,13 +3796,12 @@ class Driver(object):
         """
         addr = addr if addr else self.find_bridge()
 
-        sock = self.socket
         payload = {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()}
-        sock.sendto(dumps(payload).encode(), (addr, SEND_PORT))
+        self.send_datagram(dumps(payload).encode(), (addr, SEND_PORT))
         address = ("", "")
         try:
             while addr != address[0]:
-                data, address = sock.recvfrom(1024)
+                data, address = self.receive()
             return True
         except timeout:
             return False
@@ -1148,11 +3814,10 @@ class Driver(object):
         -------
         the IP of the bridge if exist.
         """
-        sock = self.socket
         payload = {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()}
-        sock.sendto(dumps(payload).encode(), (MULTICAST_GRP, SEND_PORT))
+        self.send_datagram(dumps(payload).encode(), (MULTICAST_GRP, SEND_PORT))
         try:
-            data, addr = sock.recvfrom(1024)
+            data, addr = self.receive()
             return addr[0]
         except timeout:
             raise UserWarning('No bridge found.')
@@ -1168,20 +3833,19 @@ class Driver(object):
         -------
 
         """
-        sock = self.socket
         address = ('', '')
         data = b''
         addr = addr if addr else self.find_bridge()
 
         payload = {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()}
-        sock.sendto(dumps(payload).encode(), (addr, SEND_PORT))
+        self.send_datagram(dumps(payload).encode(), (addr, SEND_PORT))
         try:
             while addr != address[0]:
-                data, address = sock.recvfrom(1024)
+                data, address = self.receive()
         except timeout:
             raise
         else:
-            data = loads(data.decode('utf-8'))
+            data = loads(str(data, 'utf-8'))
             result = {
                 'mac': data['mac'],
                 'deviceType': data['deviceType'],
@@ -1217,9 +3881,9 @@ class Driver(object):
             "msgID": Driver.get_timestamp(),
             "data": {'operation': STATUS}
         }
-        self.socket.sendto(dumps(payload).encode(), (bridge_info['addr'], SEND_PORT))
-        data, address = self.socket.recvfrom(1024)
-        message = loads(data.decode('utf-8'))
+        self.send_datagram(dumps(payload).encode(), (bridge_info['addr'], SEND_PORT))
+        data, address = self.receive()
+        message = loads(str(data, 'utf-8'))
         try:
             if message['actionResult'] == 'AccessToken error':
                 return False
@@ -1240,20 +3904,321 @@ class Driver(object):
         """
 
         addr = addr if addr else self.find_bridge()
-        sock = self.socket
         address = ('', '')
         data = b''
 
         payload = {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()}
-        sock.sendto(dumps(payload).encode(), (addr, SEND_PORT))
+        self.send_datagram(dumps(payload).encode(), (addr, SEND_PORT))
         try:
             while addr != address[0]:
-                data, address = sock.recvfrom(1024)
-            data = loads(data.decode('utf-8'))
+                data, address = self.receive()
+            data = loads(str(data, 'utf-8'))
             return len(data['data']) - 1
         except timeout:
             return False
 
+    async def async_check_bridge_exist(self, addr: str = None) -> bool:
+        """
+        Check is any or a given bridge exist without blocking the event loop.
+
+        Parameters
+        ----------
+        addr : IP address of the bridge.
+
+        Returns
+        -------
+        True if the bridge answered.
+        """
+        try:
+            addr = addr if addr else await self.async_find_bridge()
+            await self._async_request(
+                {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()},
+                addr,
+            )
+        except (AsyncTimeoutError, UserWarning):
+            return False
+        return True
+
+    async def async_find_bridge(self) -> str:
+        """
+        Search a bridge via multicast without blocking the event loop.
+
+        Returns
+        -------
+        the IP of the bridge if exist.
+        """
+        try:
+            message, addr = await self._async_request(
+                {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()},
+                MULTICAST_GRP,
+            )
+        except AsyncTimeoutError:
+            raise UserWarning('No bridge found.')
+        return addr[0]
+
+    async def async_discover_bridges(
+            self,
+            window: float = DISCOVERY_WINDOW,
+            resends: int = DISCOVERY_RESENDS
+    ) -> list:
+        """
+        Search all bridges on the network with a single multicast request. The request is sent again at random
+        times within the first half of the window, with the same msgID, in case a datagram gets lost. Every answer
+        received within the window is collected.
+
+        Parameters
+        ----------
+        window : Seconds to wait for answers.
+        resends : Number of additional multicast requests.
+
+        Returns
+        -------
+        List of dictionaries with mac, device type, token, address and number of devices of each bridge.
+        """
+        listener = await self.start_udp_listener()
+        payload = {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()}
+        bridges = {}
+
+        def collect(message: dict, address: tuple) -> None:
+            if message['msgType'] == MSG_TYPES['LIST_ACK'] and message['mac'] not in bridges:
+                bridges[message['mac']] = {
+                    'mac': message['mac'],
+                    'deviceType': message['deviceType'],
+                    'token': message['token'],
+                    'addr': address[0],
+                    'numberOfDevices': len(message['data']) - 1,
+                }
+
+        listener.add_collector(payload['msgID'], collect)
+        try:
+            listener.send(payload, MULTICAST_GRP)
+            elapsed = 0
+            for resend_at in sorted(uniform(0, window / 2) for _ in range(resends)):
+                await sleep(resend_at - elapsed)
+                elapsed = resend_at
+                listener.send(payload, MULTICAST_GRP)
+            await sleep(window - elapsed)
+        finally:
+            listener.remove_collector(payload['msgID'])
+        return list(bridges.values())
+
+    async def async_get_bridge_info(self, addr: str = None) -> dict:
+        """
+        Reads mac, device type, token and address of a bridge without blocking the event loop.
+
+        Parameters
+        ----------
+        addr : IP address of the bride.
+
+        Returns
+        -------
+        Dictionary with the information of the bridge.
+        """
+        addr = addr if addr else await self.async_find_bridge()
+
+        data, address = await self._async_request(
+            {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()},
+            addr,
+        )
+        return {
+            'mac': data['mac'],
+            'deviceType': data['deviceType'],
+            'token': data['token'],
+            'addr': address[0]
+        }
+
+    async def async_check_key(self, key: str, addr: str = None) -> bool:
+        """
+        Check if the given key is valid for the bridge without blocking the event loop.
+
+        Parameters
+        ----------
+        key : key from Connector+ account
+        addr : IP address of the bridge
+
+        Returns
+        -------
+        True if Key is valid.
+        """
+        if len(key) != 16:
+            return False
+
+        bridge_info = await self.async_get_bridge_info(addr)
+        payload = {
+            "msgType": MSG_TYPES['WRITE'],
+            "mac": bridge_info['mac'],
+            "deviceType": bridge_info['deviceType'],
+            "AccessToken": Driver.get_access_token(key, bridge_info['token']),
+            "msgID": Driver.get_timestamp(),
+            "data": {'operation': STATUS}
+        }
+        message, address = await self._async_request(payload, bridge_info['addr'])
+        return message.get('actionResult') != 'AccessToken error'
+
+    async def async_count_devices_on_bridge(self, addr: str = None) -> int:
+        """
+        Check if the given bridge has existing devices without blocking the event loop.
+
+        Parameters
+        ----------
+        addr : IP address of the Bridge
+
+        Returns
+        -------
+        Number of Devices.
+        """
+        addr = addr if addr else await self.async_find_bridge()
+        try:
+            data, address = await self._async_request(
+                {'msgType': MSG_TYPES['LIST'], 'msgID': Driver.get_timestamp()},
+                addr,
+            )
+        except AsyncTimeoutError:
+            return False
+        return len(data['data']) - 1
+
+    def name_store(self, config_file: str = CONFIGFILE_DEVICE_NAMES, loop: AbstractEventLoop = None) -> _NameStore:
+        """
+        Getter for the store of the readable device names. There is one store per file.
+
+        Parameters
+        ----------
+        config_file : Path and name of the file.
+        loop : Asyncio event loop for writing the file, used when the store is created (optional).
+
+        Returns
+        -------
+        The name store.
+        """
+        if config_file not in self._name_stores:
+            self._name_stores[config_file] = _NameStore(config_file, loop, self._logger)
+        return self._name_stores[config_file]
+
+    def snapshot_store(self, config_file: str = CONFIGFILE_SNAPSHOT, loop: AbstractEventLoop = None) -> _SnapshotStore:
+        """
+        Getter for the store of the bridge snapshots. There is one store per file.
+
+        Parameters
+        ----------
+        config_file : Path and name of the file.
+        loop : Asyncio event loop for writing the file, used when the store is created (optional).
+
+        Returns
+        -------
+        The snapshot store.
+        """
+        if config_file not in self._snapshot_stores:
+            self._snapshot_stores[config_file] = _SnapshotStore(config_file, loop, self._logger)
+        return self._snapshot_stores[config_file]
+
+    async def flush_names(self) -> None:
+        """
+        Writes all pending name changes to their files.
+        """
+        for name_store in self._name_stores.values():
+            await name_store.async_flush()
+
+    def receive(self) -> (memoryview, tuple):
+        """
+        Receives a datagram on the blocking socket. The datagram is written into a preallocated buffer, which is
+        big enough for the largest UDP payload, so long device lists are not truncated.
+
+        Returns
+        -------
+        Tuple of the received data as view on the buffer and the address of the sender. The view is only valid
+        until the next call.
+        """
+        size, address = self.socket.recvfrom_into(self._receive_buffer)
+        self._trace.record(TRACE_IN, address, bytes(self._receive_view[:size]))
+        self._metrics.inc('siro_bytes_received_total', (('address', address[0]),), size)
+        return self._receive_view[:size], address
+
+    def send_datagram(self, data: bytes, addr: tuple) -> None:
+        """
+        Sends a datagram on the socket and records it in the trace.
+
+        Parameters
+        ----------
+        data : The datagram as bytes.
+        addr : Address of the receiver.
+        """
+        self._trace.record(TRACE_OUT, addr, data)
+        self._metrics.inc('siro_bytes_sent_total', (('address', addr[0]),), len(data))
+        self.socket.sendto(data, addr)
+
+    @property
+    def metrics(self) -> _Metrics:
+        """
+        Getter for the metrics of the driver, its listener and all bridges.
+
+        Returns
+        -------
+        The metrics registry.
+        """
+        return self._metrics
+
+    def register_command_callback(self, callback) -> None:
+        """
+        Register a function, which gets the span of every traced command, e.g. for exporting it to a tracing system.
+        A command is reported when its final position is reported or when a newer command to the same device
+        replaces it.
+
+        Parameters
+        ----------
+        callback : Function with the device and the span as dictionary as arguments.
+        """
+        self._command_callbacks.add(callback)
+
+    def remove_command_callback(self, callback) -> None:
+        """
+        Remove a previously registered command callback.
+        """
+        self._command_callbacks.discard(callback)
+
+    def _command_finished(self, device: _Device, command: _CommandTrace) -> None:
+        """
+        Passes the span of a finished or replaced command to the command callbacks.
+
+        Parameters
+        ----------
+        device : The device of the command.
+        command : The trace of the command.
+        """
+        if not self._command_callbacks:
+            return
+        span = command.as_dict()
+        for callback in list(self._command_callbacks):
+            try:
+                callback(device, span)
+            except Exception:
+                self._logger.exception(f"Command callback for device {device.mac} failed.")
+
+    async def serve_metrics(self, host: str = '127.0.0.1', port: int = METRICS_PORT) -> AbstractServer:
+        """
+        Serves the metrics in the Prometheus text format via HTTP on a local port.
+
+        Parameters
+        ----------
+        host : Local address to listen on.
+        port : Local port to listen on.
+
+        Returns
+        -------
+        The server, which has to be closed by the caller.
+        """
+        return await self._metrics.serve(host, port)
+
+    @property
+    def trace(self) -> _ProtocolTrace:
+        """
+        Getter for the ring buffer of the latest datagrams.
+
+        Returns
+        -------
+        The protocol trace.
+        """
+        return self._trace
+
     @property
     def socket(self) -> socket:
         """
@@ -1279,6 +4244,10 @@ class Driver(object):
         """
         Gentle closing the socket.
         """
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+            self._listener = None
         self._socket.close()
         self._socket = None
 
@@ -1326,10 +4295,10 @@ class Driver(object):
 
         Returns
         -------
-        Returns a timestamp as string.
+        Returns a timestamp as string. The identifiers start with the timestamp of the module import and are
+        counted up, so they are monotonic and unique within the process, even for many messages per millisecond.
         """
-        from datetime import datetime
-        return datetime.now().strftime("%Y%m%d%H%M%S%f")[0:17]
+        return str(next(Driver._message_ids))
 
     @staticmethod
     def get_logger(loglevel_: int = None, write_log_to_file: bool = False) -> Logger: